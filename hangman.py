@@ -22,26 +22,78 @@ import threading
 import re
 import math
 import struct
+import mmap
+import io
+import zlib
+import base64
+import hashlib
+import collections
+import operator
+import functools
+from array import array
+from itertools import repeat
 import wave
 import tempfile
 import subprocess
+import csv
+import itertools
+import unicodedata
+import concurrent.futures
+import contextlib
+import heapq
+import sqlite3
+import queue
+import atexit
+import codecs
+import selectors
+import contextvars
+import asyncio
+import socket
+import socketserver
+import signal
+import multiprocessing
 from colorama import init, Fore, Back, Style
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import fcntl
+except ImportError:         # Windows: shard files are written unlocked
+    fcntl = None
+
+try:
+    import termios
+    import tty
+except ImportError:         # Windows: games read whole lines with input()
+    termios = tty = None
+
 init(autoreset=True)
 
 #
 #  TERMINAL UTILITIES
 #
 
+# (columns, lines) of the remote terminal while drawing for a server session;
+# None means the local terminal
+_remote_term = contextvars.ContextVar('remote_term', default=None)
+
 def term_width():
     """Get current terminal width"""
-    return shutil.get_terminal_size((80, 24)).columns
+    remote = _remote_term.get()
+    return remote[0] if remote else shutil.get_terminal_size((80, 24)).columns
 
 def term_height():
-    return shutil.get_terminal_size((80, 24)).lines
+    remote = _remote_term.get()
+    return remote[1] if remote else shutil.get_terminal_size((80, 24)).lines
 
 def clear():
-    os.system('cls' if os.name == 'nt' else 'clear')
+    if _remote_term.get():
+        sys.stdout.write('\x1b[H\x1b[2J')
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
 
 def strip_ansi(s):
     return re.sub(r'\x1b\[[0-9;]*m', '', s)
@@ -71,6 +123,77 @@ def typewrite(text, delay=0.015):
         time.sleep(delay)
     print()
 
+#  KEY INPUT
+#
+#  On a POSIX terminal games read single keystrokes: stdin is put in cbreak
+#  mode (no echo, no line buffering, Ctrl-C still works) and waited on with
+#  a selector, so the loop can also wake for the countdown.  Everything that
+#  arrived by the time it wakes is returned together.  HANGMAN_INPUT=line
+#  keeps the old one-command-per-Enter prompt.
+
+INPUT_MODE = os.environ.get('HANGMAN_INPUT', 'auto')   # auto | line
+INPUT_TICK = 0.25       # longest wait between countdown checks, seconds
+_ESCAPES = re.compile('\x1b(?:\\[[0-9;?]*[ -/]*[@-~]|O.)')    # arrows, F-keys, ...
+
+def key_input_available():
+    return (INPUT_MODE != 'line' and termios is not None
+            and sys.stdin.isatty() and sys.stdout.isatty())
+
+class InputStats:
+    __slots__ = ('frames', 'latency_total', 'latency_max')
+
+    def __init__(self):
+        self.frames = 0
+        self.latency_total = self.latency_max = 0.0
+
+    def latency(self, seconds):
+        self.frames += 1
+        self.latency_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+
+input_stats = InputStats()      # keystroke read -> redrawn frame
+
+class KeyReader:
+    """Keystrokes from a terminal in cbreak mode, waited on with a selector."""
+
+    def __init__(self, fd=None):
+        self.fd = sys.stdin.fileno() if fd is None else fd
+        self._decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self._sel = None
+        self._saved = None
+
+    def __enter__(self):
+        self._saved = termios.tcgetattr(self.fd)
+        tty.setcbreak(self.fd)
+        self._sel = selectors.DefaultSelector()
+        self._sel.register(self.fd, selectors.EVENT_READ)
+        return self
+
+    def __exit__(self, *exc):
+        self._sel.close()
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+
+    @contextlib.contextmanager
+    def cooked(self):
+        """Normal line input for a while (screens that call input())."""
+        termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+        try:
+            yield
+        finally:
+            tty.setcbreak(self.fd)
+
+    def read(self, timeout):
+        """Keys typed so far, waiting up to `timeout` for the first; [] if none."""
+        if not self._sel.select(timeout):
+            return []
+        data = os.read(self.fd, 1024)
+        while self._sel.select(0):
+            chunk = os.read(self.fd, 1024)
+            if not chunk:
+                break
+            data += chunk
+        return list(_ESCAPES.sub('', self._decoder.decode(data)))
+
 def blink_line(text, times=2, pause=0.1):
     for _ in range(times):
         sys.stdout.write('\r' + text)
@@ -121,152 +244,787 @@ _music_on = False
 _music_stop = threading.Event()
 _music_thread = None
 
-def _make_wav(filename, samples, rate=22050):
-    with wave.open(filename, 'w') as wf:
+SFX_RATE = 22050
+SOUND_CACHE_DIR = os.environ.get('HANGMAN_SOUND_CACHE')  # None → memory only
+
+# Synthesis works on whole buffers: NumPy float arrays when NumPy is
+# installed, otherwise array('d') built through C-level map()/zip() chains,
+# so neither path runs a Python bytecode loop per sample.
+
+def _concat(parts):
+    if np is not None:
+        return np.concatenate(parts) if parts else np.zeros(0)
+    out = array('d')
+    for p in parts:
+        out.extend(p)
+    return out
+
+def _pcm(samples):
+    """Clamp float samples to 16-bit and return little-endian PCM bytes."""
+    if np is not None:
+        return np.clip(np.asarray(samples, dtype=float), -32767, 32767).astype('<i2').tobytes()
+    samples = samples if isinstance(samples, array) else array('d', samples)
+    n = len(samples)
+    if n and (max(samples) > 32767 or min(samples) < -32767):
+        samples = map(max, repeat(-32767.0, n), map(min, repeat(32767.0, n), samples))
+    out = array('h', map(int, samples))
+    if sys.byteorder == 'big':
+        out.byteswap()
+    return out.tobytes()
+
+def _wav_bytes(samples, rate=SFX_RATE):
+    buf = io.BytesIO()
+    with wave.open(buf, 'wb') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)
         wf.setframerate(rate)
-        wf.writeframes(b''.join(
-            struct.pack('<h', max(-32767, min(32767, int(s)))) for s in samples))
+        wf.writeframes(_pcm(samples))
+    return buf.getvalue()
+
+def _make_wav(filename, samples, rate=SFX_RATE):
+    with open(filename, 'wb') as f:
+        f.write(_wav_bytes(samples, rate))
+
+def _envelope(n, fade_n):
+    if np is not None:
+        i = np.arange(n, dtype=float)
+        return np.minimum(np.minimum(i / fade_n, 1.0), (n - i) / fade_n)
+    return array('d', map(min, map(operator.truediv, range(n), repeat(float(fade_n), n)),
+                          repeat(1.0, n),
+                          map(operator.truediv, range(n, 0, -1), repeat(float(fade_n), n))))
+
+def _apply_fade(out, fade_n):
+    # only the ramps differ from 1.0, so only they are touched
+    n = len(out)
+    if n <= 2 * fade_n:
+        out[:] = array('d', map(operator.mul, out, _envelope(n, fade_n)))
+        return
+    ramp = array('d', map(operator.truediv, range(fade_n), repeat(float(fade_n), fade_n)))
+    out[:fade_n] = array('d', map(operator.mul, out[:fade_n], ramp))
+    ramp = array('d', map(operator.truediv, range(fade_n, 0, -1), repeat(float(fade_n), fade_n)))
+    out[n - fade_n:] = array('d', map(operator.mul, out[n - fade_n:], ramp))
+
+def _partials(freqs, n, rate):
+    # sum of unit sines, left lazy so the caller's scaling fuses into one pass
+    waves = [map(math.sin, map(operator.mul, range(n), repeat(2 * math.pi * f / rate, n)))
+             for f in freqs]
+    return functools.reduce(lambda acc, w: map(operator.add, acc, w), waves)
+
+def _shape(wave, n, scale, fade_n):
+    out = array('d', map(operator.mul, wave, repeat(scale, n)))
+    if fade_n:
+        _apply_fade(out, fade_n)
+    return out
 
-def _sine_wave(freq, duration, rate=22050, volume=0.4, fade=0.06):
+def _sine_wave(freq, duration, rate=SFX_RATE, volume=0.4, fade=0.06):
     n = int(rate * duration)
     fade_n = int(rate * fade)
-    out = []
-    for i in range(n):
-        amp = math.sin(2 * math.pi * freq * i / rate)
-        env = min(i / fade_n, 1.0, (n - i) / fade_n) if fade_n else 1.0
-        out.append(amp * env * volume * 32767)
-    return out
-
-def _chord(frequencies, duration, volume=0.28, rate=22050):
+    if np is not None:
+        out = np.sin(np.arange(n) * (2 * math.pi * freq / rate)) * (volume * 32767)
+        if fade_n:
+            out *= _envelope(n, fade_n)
+        return out
+    return _shape(_partials((freq,), n, rate), n, volume * 32767, fade_n)
+
+def _chord(frequencies, duration, volume=0.28, rate=SFX_RATE, fade=0.06):
     n = int(rate * duration)
-    out = [0.0] * n
-    for f in frequencies:
-        for i, s in enumerate(_sine_wave(f, duration, rate, volume / len(frequencies))):
-            out[i] += s
-    return out
+    fade_n = int(rate * fade)
+    scale = volume / len(frequencies) * 32767
+    if np is not None:
+        i = np.arange(n) * (2 * math.pi / rate)
+        out = sum(np.sin(i * f) for f in frequencies) * scale
+        if fade_n:
+            out *= _envelope(n, fade_n)
+        return out
+    return _shape(_partials(frequencies, n, rate), n, scale, fade_n)
+
+# Effect recipes: a tuple of steps, each ('tone', freq, dur, vol),
+# ('chord', freqs, dur, vol) or ('rest', 0, dur, 0).  The recipe itself is the cache key, so any
+# change to an effect's parameters gets a fresh render.
+def _tones(notes, dur, vol):
+    return tuple(('tone', n, dur, vol) for n in notes)
+
+_SFX = {
+    'correct':     (('tone', 523, 0.07, 0.4), ('tone', 659, 0.07, 0.4), ('tone', 784, 0.13, 0.4)),
+    'wrong':       (('tone', 311, 0.09, 0.35), ('tone', 220, 0.16, 0.3)),
+    'win':         _tones([523, 659, 784, 1047, 1319], 0.11, 0.38)
+                   + (('chord', (523, 659, 784), 0.5, 0.42),),
+    'lose':        _tones([440, 370, 311, 247], 0.14, 0.32),
+    'hint':        (('chord', (880, 1100), 0.08, 0.28), ('chord', (1047, 1319), 0.16, 0.28)),
+    'achievement': _tones([523, 659, 784, 880, 1047, 1319], 0.09, 0.36)
+                   + (('chord', (659, 784, 988), 0.45, 0.4),),
+    'click':       (('tone', 1200, 0.025, 0.18),),
+    'danger':      (('tone', 220, 0.11, 0.38), ('tone', 185, 0.09, 0.3)),
+    'fanfare':     _tones([523, 523, 659, 784, 784, 659, 523, 659, 784, 1047], 0.10, 0.36),
+    'tick':        (('tone', 900, 0.03, 0.12),),
+}
 
-def _play(samples, rate=22050, block=False):
-    if not _sfx_on:
-        return
-    def _do():
+def _render(recipe, rate=SFX_RATE):
+    parts = []
+    for kind, freq, dur, vol in recipe:
+        if kind == 'tone':
+            parts.append(_sine_wave(freq, dur, rate, vol))
+        elif kind == 'chord':
+            parts.append(_chord(freq, dur, vol, rate))
+        else:
+            n = int(rate * dur)
+            parts.append(np.zeros(n) if np is not None else array('d', bytes(8 * n)))
+    return _concat(parts)
+
+class SoundBank:
+    """Renders each effect once to WAV bytes and keeps them in a bounded LRU.
+
+    With a cache_dir the rendered files are also stored on disk under a hash
+    of the recipe, so later runs skip synthesis entirely.
+    """
+    VERSION = 2  # bump when the synthesis code changes the output
+
+    def __init__(self, rate=SFX_RATE, capacity=64, cache_dir=None):
+        self.rate = rate
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self._cache = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.disk_hits = 0
+        self.synth_time = 0.0
+
+    def digest(self, recipe):
+        return hashlib.sha1(repr((self.VERSION, self.rate, recipe)).encode()).hexdigest()
+
+    def _disk_path(self, recipe):
+        return os.path.join(self.cache_dir, self.digest(recipe) + '.wav')
+
+    def _load(self, recipe):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(recipe), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, recipe, data):
+        if not self.cache_dir:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, self._disk_path(recipe))
+        except OSError:
+            pass
+
+    def get(self, effect):
+        recipe = _SFX[effect] if isinstance(effect, str) else effect
+        key = (recipe, self.rate)
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+        data = self._load(recipe)
+        if data is not None:
+            self.disk_hits += 1
+        else:
+            t0 = time.perf_counter()
+            data = _wav_bytes(_render(recipe, self.rate), self.rate)
+            self.synth_time += time.perf_counter() - t0
+            self._store(recipe, data)
+        with self._lock:
+            self._cache[key] = data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        return data
+
+    def warm(self, effects=None):
+        for name in effects or _SFX:
+            self.get(name)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+_bank = SoundBank(cache_dir=SOUND_CACHE_DIR)
+
+def _wav_frames(data):
+    with wave.open(io.BytesIO(data), 'rb') as wf:
+        return wf.readframes(wf.getnframes())
+
+def _mix_pcm(chunks, gain=1.0):
+    """Sum equal-length s16le chunks, scale by gain and clip to 16 bits."""
+    if len(chunks) == 1 and gain == 1.0:
+        return chunks[0]
+    if np is not None:
+        acc = sum(np.frombuffer(c, dtype='<i2').astype(np.int32) for c in chunks)
+        if gain != 1.0:
+            acc = acc * gain
+        return np.clip(acc, -32767, 32767).astype('<i2').tobytes()
+    waves = []
+    for c in chunks:
+        a = array('h')
+        a.frombytes(c)
+        if sys.byteorder == 'big':
+            a.byteswap()
+        waves.append(a)
+    acc = functools.reduce(lambda x, y: map(operator.add, x, y), waves)
+    if gain != 1.0:
+        acc = map(int, map(operator.mul, acc, repeat(gain)))
+    acc = list(acc)
+    if acc and (max(acc) > 32767 or min(acc) < -32767):
+        n = len(acc)
+        acc = map(max, repeat(-32767, n), map(min, repeat(32767, n), acc))
+    out = array('h', acc)
+    if sys.byteorder == 'big':
+        out.byteswap()
+    return out.tobytes()
+
+# Audio output goes through one AudioBackend picked once at startup.  With a
+# streaming backend, sounds wait in a bounded queue and a single Mixer thread
+# mixes up to MIX_VOICES of them into one stream.  When the queue is full a
+# new sound is dropped; when too many voices overlap, the one with the least
+# audio left is cut, and above two voices every voice is ducked by 2/n so the
+# sum stays inside 16 bits.  The thread never writes more than MIX_LEAD
+# seconds ahead of the wall clock, so a sound starts within MIX_LEAD + one
+# block of submission.
+MIX_BLOCK = 512      # frames per mixed block (~23 ms at 22050 Hz)
+MIX_LEAD = 0.06      # seconds of audio allowed in flight ahead of real time
+MIX_VOICES = 4
+MIX_QUEUE = 16
+
+class AudioStats:
+    __slots__ = ('played', 'dropped', 'errors', 'latency_total', 'latency_max', 'bytes_out')
+
+    def __init__(self):
+        self.played = self.dropped = self.errors = self.bytes_out = 0
+        self.latency_total = self.latency_max = 0.0
+
+    def latency(self, seconds):
+        self.played += 1
+        self.latency_total += seconds
+        self.latency_max = max(self.latency_max, seconds)
+
+class AudioBackend:
+    """Where mixed audio ends up.
+
+    Streaming backends take raw mono s16le PCM through write() and are driven
+    by the Mixer; the others get one finished WAV per sound through play().
+    """
+    name = 'base'
+    streaming = True
+
+    def __init__(self, rate=SFX_RATE):
+        self.rate = rate
+        self.stats = AudioStats()
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def write(self, pcm):
+        raise NotImplementedError
+
+    def play(self, wav, block=False):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def report(self):
+        st = self.stats
+        return {
+            'backend': self.name,
+            'synth_time': _bank.synth_time,
+            'synth_count': _bank.misses - _bank.disk_hits,
+            'played': st.played,
+            'dropped': st.dropped,
+            'errors': st.errors,
+            'latency_avg': st.latency_total / st.played if st.played else 0.0,
+            'latency_max': st.latency_max,
+            'bytes_out': st.bytes_out,
+        }
+
+class PipeBackend(AudioBackend):
+    """A long-lived aplay/paplay/play process reading PCM on stdin.
+
+    A player that cannot be started, or exits within PIPE_MIN_LIFE seconds
+    of starting, is not tried again: the stream goes to a NullBackend
+    instead of forking a new process for every mixer block.
+    """
+    PIPE_MIN_LIFE = 1.0
+    COMMANDS = {
+        'aplay':  ['aplay', '-q', '-t', 'raw', '-f', 'S16_LE', '-c', '1', '-r', '{rate}', '-'],
+        'paplay': ['paplay', '--raw', '--format=s16le', '--channels=1', '--rate={rate}'],
+        'play':   ['play', '-q', '-t', 'raw', '-e', 'signed', '-b', '16', '-c', '1', '-r', '{rate}', '-'],
+    }
+
+    def __init__(self, player, rate=SFX_RATE):
+        super().__init__(rate)
+        self.name = player
+        self.cmd = [a.format(rate=rate) for a in self.COMMANDS[player]]
+        self._proc = None
+        self._started = 0.0
+        self._dead = None       # the NullBackend taking over from a failed player
+
+    @classmethod
+    def find(cls):
+        for player in cls.COMMANDS:
+            if shutil.which(player):
+                return player
+        return None
+
+    def _give_up(self):
+        self._dead = NullBackend(self.rate)
+        self._dead.stats = self.stats
+        self.close()
+
+    def write(self, pcm):
+        if self._dead:
+            return self._dead.write(pcm)
+        if self._proc is not None and self._proc.poll() is not None:
+            if time.monotonic() - self._started < self.PIPE_MIN_LIFE:
+                status = self._proc.returncode
+                self._give_up()             # exits at once: missing device, bad arguments
+                raise OSError(f'{self.name} exited with status {status}')
+            self._proc = None
+        if self._proc is None:
+            try:
+                self._proc = subprocess.Popen(self.cmd, stdin=subprocess.PIPE,
+                                              stdout=subprocess.DEVNULL,
+                                              stderr=subprocess.DEVNULL)
+            except OSError:
+                self._give_up()
+                raise
+            self._started = time.monotonic()
         try:
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp:
-                tmpname = tmp.name
-            _make_wav(tmpname, samples, rate)
-            if sys.platform == 'win32':
-                import winsound
-                flags = winsound.SND_FILENAME | (0 if block else winsound.SND_ASYNC)
-                winsound.PlaySound(tmpname, flags)
-            elif sys.platform == 'darwin':
-                p = subprocess.Popen(['afplay', tmpname],
-                                     stdout=subprocess.DEVNULL,
-                                     stderr=subprocess.DEVNULL)
-                if block:
-                    p.wait()
+            self._proc.stdin.write(pcm)
+            self._proc.stdin.flush()
+        except OSError:
+            if time.monotonic() - self._started < self.PIPE_MIN_LIFE:
+                self._give_up()
             else:
-                for cmd in [['aplay', '-q', tmpname],
-                            ['paplay', tmpname],
-                            ['play', '-q', tmpname]]:
-                    try:
-                        p = subprocess.Popen(cmd,
-                                             stdout=subprocess.DEVNULL,
-                                             stderr=subprocess.DEVNULL)
-                        if block:
-                            p.wait()
-                        return
-                    except FileNotFoundError:
-                        continue
-        except Exception:
+                self._proc = None
+            raise
+        self.stats.bytes_out += len(pcm)
+
+    def close(self):
+        if self._proc:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(1.0)
+            except (OSError, subprocess.TimeoutExpired):
+                self._proc.kill()
+            self._proc = None
+
+class _OneShotBackend(AudioBackend):
+    streaming = False
+
+    def _run(self, wav):
+        raise NotImplementedError
+
+    def play(self, wav, block=False):
+        t0 = time.monotonic()
+        def _do():
+            self.stats.latency(time.monotonic() - t0)
+            self.stats.bytes_out += len(wav)
+            try:
+                self._run(wav)
+            except (OSError, RuntimeError):
+                self.stats.errors += 1
+        if block:
+            _do()
+        else:
+            threading.Thread(target=_do, daemon=True).start()
+
+class WinsoundBackend(_OneShotBackend):
+    name = 'winsound'
+
+    @classmethod
+    def available(cls):
+        return sys.platform == 'win32'
+
+    def _run(self, wav):
+        import winsound
+        winsound.PlaySound(wav, winsound.SND_MEMORY)
+
+class AfplayBackend(_OneShotBackend):
+    name = 'afplay'
+
+    @classmethod
+    def available(cls):
+        return sys.platform == 'darwin' and shutil.which('afplay') is not None
+
+    def _run(self, wav):
+        fd, tmpname = tempfile.mkstemp(suffix='.wav')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                tmp.write(wav)
+            subprocess.call(['afplay', tmpname],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        finally:
+            os.remove(tmpname)
+
+class NullBackend(AudioBackend):
+    """Discards audio, still paced in real time by the Mixer."""
+    name = 'null'
+
+    def write(self, pcm):
+        self.stats.bytes_out += len(pcm)
+
+class WavFileBackend(AudioBackend):
+    """Records the mixed stream to a WAV file (silence between sounds is skipped)."""
+    name = 'wav'
+
+    def __init__(self, path, rate=SFX_RATE):
+        super().__init__(rate)
+        self.path = path
+        self._wf = wave.open(path, 'wb')
+        self._wf.setnchannels(1)
+        self._wf.setsampwidth(2)
+        self._wf.setframerate(rate)
+        self._lock = threading.Lock()
+
+    def write(self, pcm):
+        with self._lock:
+            if self._wf:
+                self._wf.writeframes(pcm)
+                self.stats.bytes_out += len(pcm)
+
+    def close(self):
+        with self._lock:
+            if self._wf:
+                self._wf.close()
+                self._wf = None
+
+# HANGMAN_AUDIO: auto | null | wav:<path> | aplay | paplay | play | winsound | afplay
+AUDIO_BACKEND = os.environ.get('HANGMAN_AUDIO', 'auto')
+
+def make_backend(spec=AUDIO_BACKEND):
+    if spec == 'null':
+        return NullBackend()
+    if spec.startswith('wav:'):
+        return WavFileBackend(spec[4:])
+    if spec in PipeBackend.COMMANDS:
+        return PipeBackend(spec)
+    for cls in (WinsoundBackend, AfplayBackend):
+        if spec in ('auto', cls.name) and cls.available():
+            return cls()
+    player = PipeBackend.find() if spec == 'auto' else None
+    return PipeBackend(player) if player else NullBackend()
+
+class Mixer:
+    """Mixes queued sounds and an optional music channel into one backend stream."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.rate = backend.rate
+        self.stats = backend.stats
+        self._queue = queue.Queue(MIX_QUEUE)
+        self._voices = []          # [pcm, byte offset]
+        self._music = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, pcm):
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait((pcm, time.monotonic()))
+            return True
+        except queue.Full:
+            self.stats.dropped += 1
+            return False
+
+    def set_music(self, source):
+        # source.read(nbytes) feeds a continuous channel under the effects
+        self._music = source
+        try:
+            self._queue.put_nowait(False)     # wake the thread if idle
+        except queue.Full:
             pass
-    if block:
-        _do()
-    else:
-        threading.Thread(target=_do, daemon=True).start()
+
+    def close(self):
+        self._closed = True
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        self._thread.join(1.0)
+
+    def _admit(self, item, stream_time):
+        pcm, t_enq = item
+        self._voices.append([pcm, 0])
+        if len(self._voices) > MIX_VOICES:
+            self._voices.remove(min(self._voices, key=lambda v: len(v[0]) - v[1]))
+            self.stats.dropped += 1
+        self.stats.latency(max(0.0, stream_time - t_enq))
+
+    def _run(self):
+        block = MIX_BLOCK * 2
+        clock = written = 0
+        while not self._closed:
+            music = self._music
+            playing = music is not None and music.active()
+            if not self._voices and not playing:
+                try:
+                    item = self._queue.get(timeout=0.25 if music else None)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    break
+                clock, written = time.monotonic(), 0
+                if item:
+                    self._admit(item, clock)
+                continue
+            stream_time = clock + written / self.rate
+            ahead = stream_time - time.monotonic()
+            if ahead > MIX_LEAD:
+                time.sleep(ahead - MIX_LEAD)
+            elif ahead < 0:                   # underrun: restart the clock
+                clock, written = time.monotonic(), 0
+                stream_time = clock
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    return
+                if item:
+                    self._admit(item, stream_time)
+            chunks = [music.read(block)] if playing else []
+            for v in self._voices:
+                c = v[0][v[1]:v[1] + block]
+                v[1] += block
+                chunks.append(c if len(c) == block else c + bytes(block - len(c)))
+            self._voices = [v for v in self._voices if v[1] < len(v[0])]
+            n = len(chunks) - playing
+            if not chunks:
+                continue
+            try:
+                self.backend.write(_mix_pcm(chunks, 1.0 if n <= 2 else 2.0 / n))
+            except OSError:
+                self.stats.errors += 1
+            written += MIX_BLOCK
+
+_backend = None
+_mixer = None
+_audio_lock = threading.Lock()
+
+def _audio_backend():
+    # probed once; a machine without a player falls back to the null sink
+    global _backend, _mixer
+    with _audio_lock:
+        if _backend is None:
+            _backend = make_backend()
+            if _backend.streaming:
+                _mixer = Mixer(_backend)
+        return _backend
+
+def _audio_mixer():
+    _audio_backend()
+    return _mixer
+
+def audio_report():
+    return _audio_backend().report()
+
+def _audio_close():
+    if _mixer:
+        _mixer.close()
+    if _backend:
+        _backend.close()
+
+atexit.register(_audio_close)
+
+def _play_wav(data, block=False):
+    if not _sfx_on:
+        return
+    backend = _audio_backend()
+    if _mixer is None:
+        backend.play(data, block)
+        return
+    pcm = _wav_frames(data)
+    if _mixer.submit(pcm) and block:
+        time.sleep(len(pcm) / 2 / _mixer.rate)
+
+def _play(samples, rate=SFX_RATE, block=False):
+    if not _sfx_on:
+        return
+    _play_wav(_wav_bytes(samples, rate), block)
+
+def _sfx(effect, block=False):
+    if _sfx_on:
+        _play_wav(_bank.get(effect), block)
 
 class Sounds:
     @staticmethod
     def correct():
-        _play(_sine_wave(523, 0.07) + _sine_wave(659, 0.07) + _sine_wave(784, 0.13))
+        _sfx('correct')
 
     @staticmethod
     def wrong():
-        _play(_sine_wave(311, 0.09, volume=0.35) + _sine_wave(220, 0.16, volume=0.3))
+        _sfx('wrong')
 
     @staticmethod
     def win():
-        s = []
-        for n in [523, 659, 784, 1047, 1319]:
-            s += _sine_wave(n, 0.11, volume=0.38)
-        s += _chord([523, 659, 784], 0.5, volume=0.42)
-        _play(s)
+        _sfx('win')
 
     @staticmethod
     def lose():
-        s = []
-        for n in [440, 370, 311, 247]:
-            s += _sine_wave(n, 0.14, volume=0.32)
-        _play(s)
+        _sfx('lose')
 
     @staticmethod
     def hint():
-        _play(_chord([880, 1100], 0.08) + _chord([1047, 1319], 0.16))
+        _sfx('hint')
 
     @staticmethod
     def achievement():
-        s = []
-        for n in [523, 659, 784, 880, 1047, 1319]:
-            s += _sine_wave(n, 0.09, volume=0.36)
-        s += _chord([659, 784, 988], 0.45, volume=0.4)
-        _play(s)
+        _sfx('achievement')
 
     @staticmethod
     def click():
-        _play(_sine_wave(1200, 0.025, volume=0.18))
+        _sfx('click')
 
     @staticmethod
     def danger():
-        _play(_sine_wave(220, 0.11, volume=0.38) + _sine_wave(185, 0.09, volume=0.3))
+        _sfx('danger')
 
     @staticmethod
     def fanfare():
-        s = []
-        for n in [523, 523, 659, 784, 784, 659, 523, 659, 784, 1047]:
-            s += _sine_wave(n, 0.10, volume=0.36)
-        _play(s)
+        _sfx('fanfare')
 
     @staticmethod
     def tick():
-        _play(_sine_wave(900, 0.03, volume=0.12))
+        _sfx('tick')
 
 # background music
 _PENTA = [261, 293, 329, 392, 440, 523, 587, 659, 784, 880]
+MUSIC_PATTERNS = 4     # distinct phrases rendered once and looped
+MUSIC_AHEAD = 2.0      # seconds of music rendered ahead into the ring buffer
+
+def _music_patterns(count=MUSIC_PATTERNS, seed=9):
+    # one rising run over _PENTA per phrase, with the old loop's random note
+    # lengths and rests baked in
+    rng = random.Random(seed)
+    pats = []
+    for _ in range(count):
+        steps = []
+        for f in _PENTA:
+            steps.append(('tone', f, rng.choice([0.18, 0.22, 0.28]), 0.10))
+            steps.append(('rest', 0, round(rng.uniform(0.04, 0.18), 2), 0))
+        pats.append(tuple(steps))
+    return pats
+
+class _RingBuffer:
+    def __init__(self, size):
+        self._buf = bytearray(size)
+        self._size = size
+        self._r = self._w = 0      # absolute byte counters
+        self._cond = threading.Condition()
+        self.closed = False
+
+    def write(self, data):
+        mv = memoryview(data)
+        while mv:
+            with self._cond:
+                while not self.closed and self._w - self._r == self._size:
+                    self._cond.wait()
+                if self.closed:
+                    return
+                n = min(self._size - (self._w - self._r), len(mv))
+                pos = self._w % self._size
+                first = min(n, self._size - pos)
+                self._buf[pos:pos + first] = mv[:first]
+                self._buf[:n - first] = mv[first:n]
+                self._w += n
+                self._cond.notify_all()
+            mv = mv[n:]
+
+    def read(self, n):
+        with self._cond:
+            n = min(n, self._w - self._r)
+            pos = self._r % self._size
+            first = min(n, self._size - pos)
+            out = bytes(self._buf[pos:pos + first]) + bytes(self._buf[:n - first])
+            self._r += n
+            self._cond.notify_all()
+        return out
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+class MusicSequencer:
+    """Loops pre-rendered phrases through a ring buffer read by the Mixer."""
+
+    def __init__(self, patterns, rate=SFX_RATE):
+        self.rate = rate
+        self.patterns = [_wav_frames(_bank.get(p)) for p in patterns]
+        self.ring = _RingBuffer(int(rate * MUSIC_AHEAD) * 2)
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self.ring.close()
+        self._thread.join(1.0)
+
+    def _produce(self):
+        i = 0
+        while not self.ring.closed:
+            self.ring.write(self.patterns[i % len(self.patterns)])
+            i += 1
+
+    def active(self):
+        return _sfx_on
+
+    def read(self, nbytes):
+        data = self.ring.read(nbytes)
+        return data if len(data) == nbytes else data + bytes(nbytes - len(data))
+
+_sequencer = None
 
 def _music_loop():
+    # fallback for players without a raw stream: one call per whole phrase
+    pats = [_bank.get(p) for p in _music_patterns()]
     i = 0
     while not _music_stop.is_set():
         if _sfx_on:
-            _play(_sine_wave(_PENTA[i % len(_PENTA)],
-                              random.choice([0.18, 0.22, 0.28]),
-                              volume=0.10),
-                  block=True)
-            time.sleep(random.uniform(0.04, 0.18))
+            _audio_backend().play(pats[i % len(pats)], block=True)
         else:
             time.sleep(0.3)
         i += 1
 
 def music_start():
-    global _music_on, _music_thread
+    global _music_on, _music_thread, _sequencer
+    if _music_on:
+        return
     _music_on = True
     _music_stop.clear()
-    _music_thread = threading.Thread(target=_music_loop, daemon=True)
-    _music_thread.start()
+    mixer = _audio_mixer()
+    if mixer is None:
+        _music_thread = threading.Thread(target=_music_loop, daemon=True)
+        _music_thread.start()
+        return
+    _sequencer = MusicSequencer(_music_patterns())
+    _sequencer.start()
+    mixer.set_music(_sequencer)
 
 def music_stop():
-    global _music_on
+    global _music_on, _sequencer
     _music_on = False
     _music_stop.set()
+    if _sequencer is not None:
+        if _mixer:
+            _mixer.set_music(None)
+        _sequencer.stop()
+        _sequencer = None
 
 #  COLOR PALETTE
 #
@@ -436,20 +1194,20 @@ def draw_gallows(mistakes, max_mistakes):
 _EN_ROWS = [list('qwertyuiop'), list('asdfghjkl'), list('zxcvbnm')]
 _AR_ROWS = [list('ضصثقفغعهخح'), list('جشسيبلاتنم'), list('كطئءؤرىةوز')]
 
-def draw_keyboard(guessed, correct, wrong, lang):
+def draw_keyboard(game, lang):
     rows = _EN_ROWS if lang == 'en' else _AR_ROWS
     width = term_width()
     compact = width < 55
+    key = game.index.key
     print(f"\n{CY}⌨  {'Keyboard' if lang=='en' else 'لوحة المفاتيح'}{R}")
     for row in rows:
         line = '  '
         for ch in row:
-            if ch in wrong:
-                line += (RD + f'[{ch}]' + R + ' ') if not compact else (RD + ch + R + ' ')
-            elif ch in correct:
+            bit = _LETTER_BITS.get(key(ch), 0)
+            if game.correct & bit:
                 line += (GR + f'[{ch}]' + R + ' ') if not compact else (GR + ch + R + ' ')
-            elif ch in guessed:
-                line += GY + '·  ' + R if not compact else GY + '· ' + R
+            elif game.guessed & bit:
+                line += (RD + f'[{ch}]' + R + ' ') if not compact else (RD + ch + R + ' ')
             else:
                 line += WH + f' {ch} ' + R + ' '
         print(line)
@@ -458,13 +1216,13 @@ def draw_keyboard(guessed, correct, wrong, lang):
 #  WORD DISPLAY
 #
 
-def display_word(word, guessed, reveal=False):
+def display_word(word, revealed, reveal=False):
     parts = []
-    for ch in word:
+    for ch, shown in zip(word, revealed):
         if ch == ' ':
             parts.append('    ')
             continue
-        if ch in guessed:
+        if shown:
             parts.append(f" {GR}{B}{ch.upper()}{R} ")
         elif reveal:
             parts.append(f" {RD}{B}{ch.upper()}{R} ")
@@ -472,15 +1230,15 @@ def display_word(word, guessed, reveal=False):
             parts.append(f" {WH}_{R} ")
     return ' '.join(parts)
 
-def display_word_boxes(word, guessed, reveal=False):
+def display_word_boxes(word, revealed, reveal=False):
     top, mid, bot = '', '', ''
-    for ch in word:
+    for ch, shown in zip(word, revealed):
         if ch == ' ':
             top += '    '
             mid += '    '
             bot += '    '
             continue
-        if ch in guessed:
+        if shown:
             top += f"{GR}┌─┐{R} "
             mid += f"{GR}│{ch.upper()}│{R} "
             bot += f"{GR}└─┘{R} "
@@ -575,7 +1333,7 @@ ACHIEVEMENTS = [
      'cond':lambda s:s.get('comeback',False)},
     {'id':'collect5',    'icon':'🎁','en':'Collector',    'ar':'جامع',
      'desc_en':'Unlock 5 achievements','desc_ar':'فتح 5 إنجازات',
-     'cond':lambda s:len(s.get('unlocked',[]))>=5},
+     'cond':lambda s:s.n_unlocked>=5},
     {'id':'two_k',       'icon':'💎','en':'Diamond',      'ar':'الماسة',
      'desc_en':'Reach 2000 points',   'desc_ar':'2000 نقطة',
      'cond':lambda s:s['points']>=2000},
@@ -641,11 +1399,1128 @@ AR_WORDS = [
     {"w":"متصفح",    "cat":"تقنية",     "h":"كروم وفايرفوكس وسفاري"},
 ]
 
+#  WORD BANKS
+#
+#  A WordBank is an indexable sequence of {'w', 'cat', 'h'} entries for one
+#  language.  The literals above are the default; large banks are streamed
+#  in from CSV (word,category,hint) or NDJSON files by import_words().
+
+_AR_MARKS = re.compile('[\u0640\u064B-\u065F\u0670]')   # tatweel and harakat
+_AR_WORD = re.compile('^[\u0621-\u063A\u0641-\u064A ]+$')
+_EN_WORD = re.compile('^[a-z ]+$')
+_FIELD_ALIASES = {'w': 'w', 'word': 'w', 'cat': 'cat', 'category': 'cat', 'h': 'h', 'hint': 'h',
+                  'f': 'f', 'freq': 'f', 'frequency': 'f', 'weight': 'f',
+                  'd': 'd', 'difficulty': 'd'}
+
+def normalise_word(word, lang):
+    word = unicodedata.normalize('NFC', word).strip().lower()
+    word = ' '.join(word.split())
+    if lang == 'ar':
+        word = _AR_MARKS.sub('', word)
+    return word
+
+def _clean_entry(raw, lang):
+    """Validate one raw record; returns a bank entry or None."""
+    e = {}
+    for k, v in raw.items():
+        k = _FIELD_ALIASES.get(str(k).strip().lower())
+        if k and isinstance(v, str):
+            e[k] = v.strip()
+        elif k in ('f', 'd') and isinstance(v, (int, float)):
+            e[k] = v
+    word = normalise_word(e.get('w', ''), lang)
+    if len(word.replace(' ', '')) < 2 or not (_AR_WORD if lang == 'ar' else _EN_WORD).match(word):
+        return None
+    out = {'w': word, 'cat': e.get('cat') or '?', 'h': e.get('h', '')}
+    if e.get('f', '') != '':
+        try:
+            f = float(e['f'])
+        except ValueError:
+            return None
+        if not f > 0 or f == float('inf'):
+            return None
+        if f != 1.0:
+            out['f'] = f     # relative frequency; 1 when absent
+    if e.get('d', '') != '':
+        try:
+            d = float(e['d'])
+        except ValueError:
+            return None
+        if not 0.0 <= d <= 1.0:
+            return None
+        out['d'] = d         # measured difficulty, see simulate()
+    return out
+
+def _import_chunk(rows, fmt, lang, header):
+    # runs in a worker process; dedupes within the chunk
+    out, seen, bad = [], set(), 0
+    for row in rows:
+        try:
+            raw = json.loads(row) if fmt == 'ndjson' else dict(zip(header, row))
+        except ValueError:
+            raw = None
+        e = _clean_entry(raw, lang) if isinstance(raw, dict) else None
+        if e is None:
+            bad += 1
+        elif e['w'] not in seen:
+            seen.add(e['w'])
+            out.append(e)
+    return out, bad
+
+#  Words are bucketed into difficulty tiers once per bank, from features
+#  that make a word harder to guess: length, distinct letters, how rare
+#  its letters are in the bank, and (Arabic) confusable or non-joining
+#  letter forms.  Tiers are the score tertiles, so every bucket is used.
+#  Banks whose every entry carries a measured difficulty ('d', written by
+#  the balancing harness) are tiered by that instead.
+
+TIERS = tuple(DIFFICULTY)
+_AR_CONFUSABLE = set('ءأإآؤئةى')
+_AR_NONJOIN = set('اأإآدذرزوؤة')
+
+def letter_frequencies(words):
+    counts = collections.Counter()
+    for w in words:
+        counts.update(w.replace(' ', ''))
+    total = sum(counts.values()) or 1
+    return {c: n / total for c, n in counts.items()}
+
+def word_features(word, lang, freq):
+    """(length, distinct letters, rarity in bits, letter-form complexity)."""
+    letters = word.replace(' ', '')
+    distinct = set(letters)
+    rarity = sum(-math.log2(freq.get(c, 1e-6)) for c in distinct) / max(len(distinct), 1)
+    complexity = 0
+    if lang == 'ar':
+        complexity = sum(c in _AR_CONFUSABLE for c in letters)
+        complexity += sum(c in _AR_NONJOIN for c in letters[:-1])   # extra word pieces
+    return len(letters), len(distinct), rarity, complexity
+
+def difficulty_score(features):
+    length, distinct, rarity, complexity = features
+    return distinct + 0.5 * length + rarity + complexity
+
+def word_tiers(words, lang, measured=None):
+    """Tier index (0 easy .. 2 hard) for each word, by score tertile."""
+    words = list(words)
+    if measured is not None and None not in measured:
+        scores = list(measured)
+    else:
+        freq = letter_frequencies(words)
+        scores = [difficulty_score(word_features(w, lang, freq)) for w in words]
+    tiers = bytearray(len(words))
+    for rank, i in enumerate(sorted(range(len(words)), key=scores.__getitem__)):
+        tiers[i] = rank * len(TIERS) // len(words)
+    return tiers
+
+class WordBank:
+    def __init__(self, lang, entries, source='builtin'):
+        self.lang = lang
+        self.entries = entries
+        self.source = source
+        h = hashlib.sha256()
+        for w in entries:
+            d = f"\t{w['d']}" if 'd' in w else ''      # measured difficulty moves tiers
+            h.update(f"{w['w']}\t{w.get('cat', '')}\t{w['h']}{d}\n".encode('utf-8'))
+        self.version = h.hexdigest()[:16]
+        self.tiers = word_tiers((e['w'] for e in entries), lang, [e.get('d') for e in entries])
+        self.weighted = any('f' in e for e in entries)
+        self._buckets = {}
+        for t, name in enumerate(TIERS):
+            self._buckets[name] = array('I', (i for i, x in enumerate(self.tiers) if x == t))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, i):
+        return self.entries[i]
+
+    def tier_of(self, i):
+        return self.tiers[i]
+
+    def meta(self, i):
+        """(category, frequency) of word i."""
+        e = self.entries[i]
+        return e.get('cat', '?'), e.get('f', 1.0)
+
+    def bucket_size(self, tier):
+        return len(self._buckets[tier])
+
+    def bucket_item(self, tier, k):
+        return self._buckets[tier][k]
+
+    def draw(self, rng=random, tier=None):
+        """Index of a random word, from one difficulty tier if given."""
+        m = self.bucket_size(tier) if tier else 0
+        return self.bucket_item(tier, rng.randrange(m)) if m else rng.randrange(len(self))
+
+    def random(self, rng=random, tier=None):
+        return self[self.draw(rng, tier)]
+
+    def words(self):
+        return (self[i]['w'] for i in range(len(self)))
+
+IMPORT_CHUNK_ROWS = 20000
+IMPORT_POOL_MIN_BYTES = 4 << 20    # smaller files are imported in-process
+
+def _chunks(path, fmt):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            rows = csv.reader(f)
+            header = [h.strip().lower() for h in next(rows, [])]
+        else:
+            rows, header = (line for line in f if line.strip()), None
+        yield header
+        while True:
+            chunk = list(itertools.islice(rows, IMPORT_CHUNK_ROWS))
+            if not chunk:
+                return
+            yield chunk
+
+def import_words(path, lang, workers=None):
+    """Stream a CSV/NDJSON word file into a WordBank; returns (bank, report)."""
+    fmt = 'csv' if path.lower().endswith('.csv') else 'ndjson'
+    t0 = time.perf_counter()
+    chunks = _chunks(path, fmt)
+    header = next(chunks)
+    entries, seen = [], set()
+    rows = bad = 0
+
+    def _take(result, n):
+        nonlocal rows, bad
+        got, nbad = result
+        rows += n
+        bad += nbad
+        for e in got:
+            if e['w'] not in seen:
+                seen.add(e['w'])
+                entries.append(e)
+
+    if workers == 1 or os.path.getsize(path) < IMPORT_POOL_MIN_BYTES:
+        workers = 1
+        for chunk in chunks:
+            _take(_import_chunk(chunk, fmt, lang, header), len(chunk))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+            pending = collections.deque()   # bounded, and keeps file order
+            for chunk in chunks:
+                pending.append((pool.submit(_import_chunk, chunk, fmt, lang, header), len(chunk)))
+                if len(pending) >= 2 * workers:
+                    fut, n = pending.popleft()
+                    _take(fut.result(), n)
+            while pending:
+                fut, n = pending.popleft()
+                _take(fut.result(), n)
+    secs = time.perf_counter() - t0
+    report = {'rows': rows, 'entries': len(entries), 'rejected': bad,
+              'duplicates': rows - bad - len(entries), 'seconds': secs,
+              'rows_per_sec': rows / secs if secs else 0.0, 'workers': workers}
+    return WordBank(lang, entries, source=path), report
+
+#  Compiled banks (.hwb) are memory-mapped and decoded one entry at a time:
+#
+#    header   magic, format, lang, bank version, n_words, n_strings,
+#             blob size, words per tier, flags (1 = has frequencies)
+#    records  n_words × (word, category, hint string ids, letter count, tier,
+#             frequency)
+#    offsets  (n_strings + 1) × u32 into the blob
+#    blob     UTF-8 strings; categories and hints are interned
+#    buckets  n_words × u32 word indices, grouped by tier
+
+WB_MAGIC = b'HWB1'
+WB_FORMAT = 3
+WB_HEADER = struct.Struct('<4sH2s16sIII3II')
+WB_RECORD = struct.Struct('<IIIHHf')
+
+def compile_word_bank(bank, path):
+    """Write bank as a compiled .hwb file; returns its size in bytes."""
+    strings, ids = [], {}
+
+    def intern(s):
+        i = ids.get(s)
+        if i is None:
+            i = ids[s] = len(strings)
+            strings.append(s.encode('utf-8'))
+        return i
+
+    records, tiers = bytearray(), bank.tiers
+    for i in range(len(bank)):
+        e = bank[i]
+        records += WB_RECORD.pack(intern(e['w']), intern(e.get('cat', '?')), intern(e['h']),
+                                  len(e['w'].replace(' ', '')), tiers[i], e.get('f', 1.0))
+    offsets, pos = array('I', [0]), 0
+    for b in strings:
+        pos += len(b)
+        offsets.append(pos)
+    buckets = [array('I', (i for i, x in enumerate(tiers) if x == t)) for t in range(len(TIERS))]
+    header = WB_HEADER.pack(WB_MAGIC, WB_FORMAT, bank.lang.encode('ascii'), bank.version.encode('ascii'),
+                            len(bank), len(strings), pos, *map(len, buckets), int(bank.weighted))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(header)
+        f.write(records)
+        for a in [offsets] + buckets:
+            if sys.byteorder != 'little':
+                a.byteswap()
+        f.write(offsets.tobytes())
+        for b in strings:
+            f.write(b)
+        for a in buckets:
+            f.write(a.tobytes())
+    os.replace(tmp, path)
+    return len(header) + len(records) + 4 * len(offsets) + pos + 4 * len(bank)
+
+class MappedWordBank(WordBank):
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, fmt, lang, version, n, nstr, blob, *counts, flags = WB_HEADER.unpack_from(self._mm, 0)
+        if magic != WB_MAGIC or fmt != WB_FORMAT:
+            self._mm.close()
+            raise ValueError(f'{path}: not a compiled word bank (or an old format; recompile it)')
+        self.lang = lang.decode('ascii')
+        self.version = version.decode('ascii')
+        self.source = path
+        self.weighted = bool(flags & 1)
+        self._n = n
+        self._cats = {}
+        self._offsets = WB_HEADER.size + n * WB_RECORD.size
+        self._blob = self._offsets + 4 * (nstr + 1)
+        self._buckets, pos = {}, self._blob + blob
+        for name, count in zip(TIERS, counts):
+            self._buckets[name] = (pos, count)
+            pos += 4 * count
+
+    def _string(self, i):
+        a, b = struct.unpack_from('<II', self._mm, self._offsets + 4 * i)
+        return self._mm[self._blob + a:self._blob + b].decode('utf-8')
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._n
+        if not 0 <= i < self._n:
+            raise IndexError(i)
+        w, cat, h, _, _, f = WB_RECORD.unpack_from(self._mm, WB_HEADER.size + i * WB_RECORD.size)
+        e = {'w': self._string(w), 'cat': self._string(cat), 'h': self._string(h)}
+        if f != 1.0:
+            e['f'] = f
+        return e
+
+    @property
+    def tiers(self):
+        return bytearray(map(self.tier_of, range(self._n)))
+
+    def tier_of(self, i):
+        return WB_RECORD.unpack_from(self._mm, WB_HEADER.size + i * WB_RECORD.size)[4]
+
+    def meta(self, i):
+        _, cat, _, _, _, f = WB_RECORD.unpack_from(self._mm, WB_HEADER.size + i * WB_RECORD.size)
+        name = self._cats.get(cat)
+        if name is None:
+            name = self._cats[cat] = self._string(cat)
+        return name, f
+
+    def bucket_size(self, tier):
+        return self._buckets[tier][1]
+
+    def bucket_item(self, tier, k):
+        return struct.unpack_from('<I', self._mm, self._buckets[tier][0] + 4 * k)[0]
+
+    def close(self):
+        self._mm.close()
+
+def open_word_bank(path, lang=None):
+    """Open a word file: compiled banks are mapped, text files imported."""
+    with open(path, 'rb') as f:
+        compiled = f.read(len(WB_MAGIC)) == WB_MAGIC
+    if compiled:
+        bank = MappedWordBank(path)
+        if lang and bank.lang != lang:
+            raise ValueError(f'{path} is a compiled {bank.lang!r} bank, not {lang!r}')
+        return bank
+    return import_words(path, lang)[0]
+
+_word_banks = {'en': WordBank('en', EN_WORDS), 'ar': WordBank('ar', AR_WORDS)}
+
+def word_bank(lang):
+    return _word_banks[lang]
+
+def set_word_bank(bank):
+    _word_banks[bank.lang] = bank
+
+def load_word_banks(specs):
+    """Load 'lang=path' specs (e.g. from --words or HANGMAN_WORDS)."""
+    for spec in specs:
+        lang, _, path = spec.partition('=')
+        set_word_bank(open_word_bank(path, lang.strip()))
+
+#  WEIGHTED SAMPLING
+#
+#  Themed weeks weight categories ('Security' 60% of draws) and imported
+#  banks may weight words by frequency ('f').  Draws use Vose alias tables,
+#  O(1) each: per tier, one table over categories and one per category over
+#  its words.  Tables are built on first use and cached; new category
+#  weights rebuild only the small category table.
+
+class AliasTable:
+    __slots__ = ('prob', 'alias')
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = math.fsum(weights)
+        if not n or not total > 0:
+            raise ValueError('alias table needs a positive total weight')
+        prob = array('d', (w * n / total for w in weights))
+        alias = array('I', bytes(4 * n))
+        small = [i for i, p in enumerate(prob) if p < 1.0]
+        large = [i for i, p in enumerate(prob) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        for i in itertools.chain(small, large):     # leftovers are 1 up to rounding
+            prob[i] = 1.0
+        self.prob, self.alias = prob, alias
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+CATEGORY_WEIGHTS = {}   # category -> percent of draws; others share the rest
+
+def set_category_weights(weights):
+    CATEGORY_WEIGHTS.clear()
+    CATEGORY_WEIGHTS.update(weights)
+
+def parse_category_weights(specs):
+    """'Security=60' specs (from --theme or HANGMAN_THEME) to a weights dict."""
+    weights = {}
+    for spec in specs:
+        cat, _, pct = spec.rpartition('=')
+        try:
+            weight = float(pct)
+        except ValueError:
+            weight = -1.0
+        if not cat.strip() or not 0 <= weight <= 100:
+            raise ValueError(f'bad theme {spec!r}: expected CATEGORY=PCT with PCT from 0 to 100')
+        weights[cat.strip()] = weight
+    return weights
+
+class WeightedSampler:
+    def __init__(self, bank):
+        self.bank = bank
+        self._words = {}        # (tier, cat) -> (indices, AliasTable or None, mass)
+        self._cats = {}         # (tier, weights) -> (categories, AliasTable)
+        self._by_cat = {}
+        for tier in TIERS:
+            groups = collections.defaultdict(lambda: array('I'))
+            for k in range(bank.bucket_size(tier)):
+                i = bank.bucket_item(tier, k)
+                groups[bank.meta(i)[0]].append(i)
+            self._by_cat[tier] = dict(groups)
+
+    def _word_table(self, tier, cat):
+        entry = self._words.get((tier, cat))
+        if entry is None:
+            idx = self._by_cat[tier][cat]
+            weights = [self.bank.meta(i)[1] for i in idx]
+            mass = math.fsum(weights)
+            uniform = all(w == weights[0] for w in weights)
+            entry = self._words[tier, cat] = (idx, None if uniform else AliasTable(weights), mass)
+        return entry
+
+    def _cat_table(self, tier):
+        key = (tier, tuple(sorted(CATEGORY_WEIGHTS.items())))
+        entry = self._cats.get(key)
+        if entry is None:
+            cats = sorted(self._by_cat[tier])
+            mass = [self._word_table(tier, c)[2] for c in cats]
+            fixed = {c: CATEGORY_WEIGHTS[c] for c in cats if c in CATEGORY_WEIGHTS}
+            rest = max(0.0, 100.0 - sum(fixed.values()))
+            free = math.fsum(m for c, m in zip(cats, mass) if c not in fixed)
+            weights = [fixed[c] if c in fixed else (rest * m / free if free else 0.0)
+                       for c, m in zip(cats, mass)]
+            if not math.fsum(weights) > 0:
+                weights = mass
+            if len(self._cats) > 32:
+                self._cats.clear()
+            entry = self._cats[key] = (cats, AliasTable(weights))
+        return entry
+
+    def draw(self, rng=random, tier=None):
+        tier = tier or rng.choice([t for t in TIERS if self._by_cat[t]])
+        if not self._by_cat[tier]:
+            return self.bank.draw(rng)
+        cats, table = self._cat_table(tier)
+        idx, words, _ = self._word_table(tier, cats[table.sample(rng)])
+        return idx[words.sample(rng) if words else rng.randrange(len(idx))]
+
+_weighted = {}      # bank version -> WeightedSampler
+
+def weighted_sampler(bank):
+    ws = _weighted.get(bank.version)
+    if ws is None or ws.bank is not bank:
+        ws = _weighted[bank.version] = WeightedSampler(bank)
+    return ws
+
+#  NO-REPEAT WORD SAMPLING
+#
+#  Each player keeps, per language, a bitset of the word-bank indices they
+#  have played, zlib-compressed into stats['seen'] with the bank version and
+#  per-tier counts.  A tier's bits are cleared once all its words are seen.
+#  Once decoded, the SeenWords object itself stays in stats['seen'] and is
+#  only compressed again (once per change) when the stats are serialised.
+#  Draws use rejection sampling while at most half the tier is seen, then a
+#  shuffled bag of the unseen words cached per player in this process.
+
+class SeenWords:
+    def __init__(self, bank, state=None):
+        self.bank = bank
+        if state and state.get('v') == bank.version:
+            self.bits = bytearray(zlib.decompress(base64.b64decode(state['z'])))
+            self.counts = list(state['c'])
+            self._state = state
+        else:
+            self.bits = bytearray((len(bank) + 7) // 8)
+            self.counts = [0] * len(TIERS)
+            self._state = None
+
+    def __contains__(self, i):
+        return self.bits[i >> 3] >> (i & 7) & 1
+
+    def add(self, i):
+        if i in self:
+            return
+        self._state = None
+        self.bits[i >> 3] |= 1 << (i & 7)
+        t = self.bank.tier_of(i)
+        self.counts[t] += 1
+        tier = TIERS[t]
+        if self.counts[t] >= self.bank.bucket_size(tier):    # exhausted: start over
+            for k in range(self.bank.bucket_size(tier)):
+                j = self.bank.bucket_item(tier, k)
+                self.bits[j >> 3] &= ~(1 << (j & 7)) & 0xFF
+            self.counts[t] = 0
+
+    def state(self):
+        if self._state is None:
+            self._state = {'v': self.bank.version, 'c': list(self.counts),
+                           'z': base64.b64encode(zlib.compress(bytes(self.bits))).decode('ascii')}
+        return self._state
+
+def seen_words(stats, lang):
+    """The player's SeenWords for `lang`, decoded once and kept in their stats."""
+    states = stats.get('seen')
+    if states is None:
+        states = stats['seen'] = {}
+    seen = states.get(lang)
+    bank = word_bank(lang)
+    if not isinstance(seen, SeenWords) or seen.bank is not bank:
+        seen = states[lang] = SeenWords(bank, seen.state() if isinstance(seen, SeenWords) else seen)
+    return seen
+
+def mark_seen(stats, lang, index, version):
+    seen = seen_words(stats, lang)
+    if seen.bank.version != version or index >= len(seen.bank):
+        return      # played from another word bank
+    seen.add(index)
+
+WEIGHTED_TRIES = 16
+_bags = {}      # (user, lang, tier) -> (bank version, shuffled unseen indices)
+
+def next_word(user, stats, lang, tier, rng=random):
+    """Index of a word from `tier` this player has not seen since the tier was last exhausted."""
+    bank = word_bank(lang)
+    seen = seen_words(stats, lang)
+    m = bank.bucket_size(tier)
+    if not m or seen.counts[TIERS.index(tier)] >= m:
+        return bank.draw(rng, tier)
+    if CATEGORY_WEIGHTS or bank.weighted:
+        # weighted draws, still skipping seen words; if the weight sits on
+        # words already played, fall back to an unweighted unseen word
+        ws = weighted_sampler(bank)
+        for _ in range(WEIGHTED_TRIES):
+            i = ws.draw(rng, tier)
+            if i not in seen:
+                return i
+    if 2 * seen.counts[TIERS.index(tier)] <= m:
+        while True:
+            i = bank.bucket_item(tier, rng.randrange(m))
+            if i not in seen:
+                return i
+    key = (user, lang, tier)
+    version, bag = _bags.get(key, (None, None))
+    while True:
+        if not bag or version != bank.version:
+            version = bank.version
+            bag = [j for j in map(bank.bucket_item, repeat(tier, m), range(m)) if j not in seen]
+            rng.shuffle(bag)
+            _bags[key] = (version, bag)
+            if not bag:
+                return bank.draw(rng, tier)
+        i = bag.pop()
+        if i not in seen:       # another session may have played it meanwhile
+            return i
+
+#  LETTER MATCHING
+#
+#  Guesses and word letters are compared through a fold table per language
+#  and mode, built once with str.maketrans.  'strict' only drops case and
+#  harakat; 'lenient' also folds the alef/hamza forms to ا, ى and ئ to ي,
+#  ة to ه, ؤ to و and accented Latin letters to their base letter.  A
+#  LetterIndex maps each folded letter of a word to its positions, so a guess
+#  is one dict lookup and reveals every matching position in its written
+#  form; harakat fold to nothing and are revealed with the letter they sit on.
+
+MATCH_MODE = os.environ.get('HANGMAN_MATCH', 'lenient')    # strict | lenient
+_AR_LENIENT = {'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا', 'ى': 'ي', 'ئ': 'ي', 'ة': 'ه', 'ؤ': 'و'}
+_fold_tables = {}
+
+def fold_table(lang, mode=None):
+    mode = mode or MATCH_MODE
+    table = _fold_tables.get((lang, mode))
+    if table is None:
+        marks = ''.join(map(chr, itertools.chain([0x640], range(0x64B, 0x660), [0x670])))
+        fold = {c: c.lower() for c in map(chr, range(ord('A'), ord('Z') + 1))}
+        if mode == 'lenient':
+            if lang == 'ar':
+                fold.update(_AR_LENIENT)
+            for c in map(chr, range(0xC0, 0x250)):
+                base = unicodedata.normalize('NFD', c)[0].lower()
+                if base != c.lower() and 'a' <= base <= 'z':
+                    fold[c] = base
+        table = _fold_tables[lang, mode] = str.maketrans({**fold, **dict.fromkeys(marks)})
+    return table
+
+_LETTER_BITS = {}
+
+def letter_bit(key):
+    """The bit standing for one folded letter in guessed/correct masks."""
+    bit = _LETTER_BITS.get(key)
+    if bit is None:
+        bit = _LETTER_BITS[key] = 1 << len(_LETTER_BITS)
+    return bit
+
+for _c in itertools.chain.from_iterable(_EN_ROWS + _AR_ROWS):
+    letter_bit(_c)      # keyboard letters get the low bits
+
+class LetterIndex:
+    """Folded letter -> (bit, positions) for one word, shared by every game on it."""
+    __slots__ = ('word', 'table', 'positions', 'mask')
+
+    def __init__(self, word, lang, mode=None):
+        self.word = word
+        self.table = fold_table(lang, mode)
+        positions = {}
+        key = None
+        for i, c in enumerate(word):
+            if c == ' ':
+                key = None
+                continue
+            folded = c.translate(self.table)
+            if folded:
+                key = folded
+            if key:
+                positions.setdefault(key, []).append(i)
+        self.positions = {k: (letter_bit(k), tuple(v)) for k, v in positions.items()}
+        self.mask = functools.reduce(operator.or_, (b for b, _ in self.positions.values()), 0)
+
+    def key(self, ch):
+        return ch.lower().translate(self.table)
+
+    def __len__(self):
+        return len(self.positions)
+
+@functools.lru_cache(maxsize=8192)
+def _letter_index(word, lang, mode):
+    return LetterIndex(word, lang, mode)
+
+def letter_index(word, lang, mode=None):
+    return _letter_index(word, lang, mode or MATCH_MODE)
+
+#  GAME ENGINE
+#
+#  GameState holds the rules of one game and nothing else: no printing, no
+#  input, no sleeping.  The clock only moves through tick(now), so the
+#  terminal loop passes time.time() while simulations pass whatever they like.
+
+DANGER_AT = 10      # seconds left when the warning sound plays
+
+def game_clock():
+    """Seconds since now from time.monotonic, in whole milliseconds.
+
+    Games tick on this clock so that a replay, which stores milliseconds,
+    feeds GameState exactly the same floats as the live game did.
+    """
+    t0 = time.monotonic()
+    return lambda: int((time.monotonic() - t0) * 1000) / 1000
+
+class GameState:
+    """One game: guessed/correct letters as bitmasks, counters kept running.
+
+    guess(ch) returns the points a hit earned, 0 for a miss, or None when the
+    guess is ignored (already tried, empty, game over).  buy_hint(balance)
+    returns the cost paid or None.  tick(now) returns the seconds left, rounded up,
+    and sets `alarm` on the one tick that crosses DANGER_AT.  result() gives
+    the final scoring once `outcome` is set.
+    """
+    __slots__ = ('word', 'index', 'revealed', 'max_tries', 'time_limit', 'mult', 'hint_cost',
+                 'start', 'elapsed', 'guessed', 'correct', 'wrong', 'found', 'mistakes',
+                 'combo', 'points', 'hint_used', 'alarm', 'warned', 'outcome')
+
+    def __init__(self, word, lang, difficulty, now=0.0, mode=None):
+        cfg = DIFFICULTY[difficulty]
+        self.word = word
+        self.index = letter_index(word, lang, mode)
+        self.revealed = bytearray(len(word))
+        self.max_tries = cfg['tries']
+        self.time_limit = cfg['time']
+        self.mult = cfg['mult']
+        self.hint_cost = cfg['hcost']
+        self.start = now
+        self.elapsed = 0.0
+        self.guessed = self.correct = 0
+        self.wrong = []         # missed letters as typed, for display
+        self.found = self.mistakes = self.combo = self.points = 0
+        self.hint_used = self.alarm = self.warned = False
+        self.outcome = None     # win | lose | timeout | quit
+
+    @property
+    def total(self):
+        return len(self.index)
+
+    def guess(self, ch):
+        if self.outcome:
+            return None
+        k = self.index.key(ch)
+        if not k:
+            return None
+        hit = self.index.positions.get(k)
+        if hit is None:
+            bit = letter_bit(k)
+            if self.guessed & bit:
+                return None
+            self.guessed |= bit
+            self.wrong.append(ch)
+            self.mistakes += 1
+            self.combo = 0
+            if self.mistakes >= self.max_tries:
+                self.outcome = 'lose'
+            return 0
+        bit, pos = hit
+        if self.guessed & bit:
+            return None
+        self.guessed |= bit
+        self.correct |= bit
+        for i in pos:
+            self.revealed[i] = 1
+        self.found += 1
+        self.combo += 1
+        points = int(10 * self.mult) + (self.combo - 1) * 3
+        self.points += points
+        if self.correct == self.index.mask:
+            self.outcome = 'win'
+        return points
+
+    def buy_hint(self, balance):
+        if self.outcome or self.hint_used or balance < self.hint_cost:
+            return None
+        self.hint_used = True
+        self.points -= self.hint_cost
+        return self.hint_cost
+
+    def tick(self, now):
+        self.elapsed = now - self.start
+        left = self.time_limit - self.elapsed
+        remaining = max(0, math.ceil(left))     # for display; the deadline itself is exact
+        self.alarm = False
+        if not self.outcome:
+            if left <= 0:
+                self.outcome = 'timeout'
+            elif remaining <= DANGER_AT and not self.warned:
+                self.alarm = self.warned = True
+        return remaining
+
+    def quit(self):
+        if not self.outcome:
+            self.outcome = 'quit'
+
+    def result(self):
+        won = self.outcome == 'win'
+        base = time_bonus = combo_bonus = 0
+        if won:
+            base = int(50 * self.mult)
+            time_bonus = max(0, int((self.time_limit - self.elapsed) / 2))
+            combo_bonus = int(self.combo * 4)
+        earned = base + time_bonus + combo_bonus
+        return {'outcome': self.outcome, 'won': won, 'mistakes': self.mistakes,
+                'elapsed': self.elapsed, 'letters': self.points, 'base': base,
+                'time_bonus': time_bonus, 'combo_bonus': combo_bonus,
+                'earned': earned, 'points': self.points + earned}
+
+#  SOLVER
+#
+#  For each word length a bank has, every (folded letter, position) gets a
+#  bitmap over the words of that length: bit j is set when word j has the
+#  letter there.  A pattern narrows the candidates with AND (revealed
+#  letters), ANDNOT (hit letters cannot hide in blank cells) and ANDNOT of
+#  whole-word bitmaps (missed letters).  The next guess is the untried letter
+#  whose outcome - a miss, or the set of cells it fills - splits the
+#  candidates with the highest entropy.  Answers are memoised by state, since
+#  the opening moves of every game on a word length share a handful of them.
+#  On a 100k-word bank an unmemoised opening guess takes a few milliseconds,
+#  because its split runs over the whole length bucket; later guesses take a
+#  fraction of one.  `bench solver` reports both cases.
+
+SOLVER_MEMO = 65536     # remembered (pattern, tried) answers per solver
+
+_popcount = getattr(int, 'bit_count', lambda x: bin(x).count('1'))
+
+class LengthIndex:
+    """Letter/position bitmaps over the bank words of one length."""
+    __slots__ = ('length', 'words', 'all', 'at', 'has')
+
+    def __init__(self, length, words, table):
+        self.length = length
+        self.words = words
+        n = len(words)
+        cells = {}
+        for j, w in enumerate(words):
+            for i, c in enumerate(w.translate(table)):
+                cells.setdefault(c, [[] for _ in range(length)])[i].append(j)
+        self.at = {}
+        for c, per_pos in cells.items():
+            maps = []
+            for idx in per_pos:
+                bits = bytearray((n + 7) >> 3)
+                for j in idx:
+                    bits[j >> 3] |= 1 << (j & 7)
+                maps.append(int.from_bytes(bits, 'little'))
+            self.at[c] = maps
+        self.has = {c: functools.reduce(operator.or_, maps) for c, maps in self.at.items()}
+        self.all = (1 << n) - 1
+
+class Solver:
+    """Best-next-letter search over one word bank, built per length on demand."""
+
+    def __init__(self, bank, mode=None):
+        self.bank = bank
+        self.table = fold_table(bank.lang, mode)
+        rows = _EN_ROWS if bank.lang == 'en' else _AR_ROWS
+        self.alphabet = {}      # folded letter -> keyboard letter to type
+        for c in itertools.chain.from_iterable(rows):
+            self.alphabet.setdefault(c.translate(self.table), c)
+        for w in bank.words():      # letters the keyboard rows leave out (ذ, د, ظ)
+            for c in set(w.lower().translate(self.table)) - set(self.alphabet):
+                if c != ' ':
+                    self.alphabet[c] = c
+        self._by_len = None
+        self._lengths = {}
+        self._freq = None
+        self._memo = {}
+
+    def length_index(self, length):
+        li = self._lengths.get(length)
+        if li is None:
+            if self._by_len is None:
+                self._by_len = collections.defaultdict(list)
+                for w in self.bank.words():
+                    self._by_len[len(w)].append(w.lower())
+            li = self._lengths[length] = LengthIndex(length, self._by_len.get(length, []), self.table)
+        return li
+
+    def candidates(self, pattern, hits=(), misses=()):
+        """Bitmap of the words matching `pattern` (folded letter or None per cell)."""
+        li = self.length_index(len(pattern))
+        at, none = li.at, [0] * li.length
+        c = li.all
+        for i, k in enumerate(pattern):
+            if k is not None:
+                c &= at.get(k, none)[i]
+            else:
+                for h in hits:
+                    c &= ~at.get(h, none)[i]
+            if not c:
+                return 0
+        for m in misses:
+            c &= ~li.has.get(m, 0)
+        return c
+
+    def words(self, cands, length):
+        li = self.length_index(length)
+        return [li.words[j] for j in range(cands.bit_length()) if cands >> j & 1]
+
+    def best(self, pattern, tried=()):
+        """(letter, expected information in bits) for the next guess, or (None, 0.0)."""
+        key = (tuple(pattern), frozenset(tried))
+        ans = self._memo.get(key)
+        if ans is None:
+            if len(self._memo) >= SOLVER_MEMO:
+                self._memo.clear()
+            ans = self._memo[key] = self._best(*key)
+        return ans
+
+    def _best(self, pattern, tried):
+        li = self.length_index(len(pattern))
+        hits = {k for k in pattern if k is not None}
+        cands = self.candidates(pattern, hits, tried - hits)
+        total = _popcount(cands)
+        if total < 2:
+            return self._fallback(pattern, tried, li, cands)
+        blanks = [i for i, k in enumerate(pattern) if k is None]
+        best, best_gain = None, 0.0
+        log_total = math.log2(total)
+        for k, ch in self.alphabet.items():
+            if k in tried or k not in li.has:
+                continue
+            inside = cands & li.has[k]
+            if not inside:
+                continue
+            groups = [inside]
+            at = li.at[k]
+            for i in blanks:
+                b = at[i] & inside
+                if not b:
+                    continue
+                split = []
+                for g in groups:
+                    x = g & b
+                    if x:
+                        split.append(x)
+                        if x != g:
+                            split.append(g ^ x)
+                    else:
+                        split.append(g)
+                groups = split
+            sizes = [_popcount(g) for g in groups]
+            miss = total - sum(sizes)
+            if miss:
+                sizes.append(miss)
+            gain = log_total - sum(n * math.log2(n) for n in sizes) / total
+            if gain > best_gain:
+                best, best_gain = ch, gain
+        if best is None:
+            return self._fallback(pattern, tried, li, cands)
+        return best, best_gain
+
+    def _fallback(self, pattern, tried, li, cands):
+        # one candidate left: type one of its letters; none: the commonest letter
+        if cands:
+            word = li.words[cands.bit_length() - 1].translate(self.table)
+            for i, k in enumerate(pattern):
+                if k is None and word[i] in self.alphabet:
+                    return self.alphabet[word[i]], 0.0
+        for k in self.by_frequency():
+            if k not in tried:
+                return self.alphabet[k], 0.0
+        return None, 0.0
+
+    def by_frequency(self):
+        """Alphabet letters (folded), commonest in the bank first."""
+        if self._freq is None:
+            freq = letter_frequencies(w.lower().translate(self.table) for w in self.bank.words())
+            self._freq = sorted(self.alphabet, key=lambda k: -freq.get(k, 0.0))
+        return self._freq
+
+    def pattern(self, game):
+        """(pattern, tried letters) of a GameState, as folded letters."""
+        word, table = game.word, self.table
+        pattern = [c.translate(table) if shown or c == ' ' else None
+                   for c, shown in zip(word, game.revealed)]
+        tried = [k for k in self.alphabet if game.guessed & _LETTER_BITS.get(k, 0)]
+        tried += [c.translate(table) for c in game.wrong]
+        return pattern, set(tried)
+
+    def suggest(self, game):
+        """Letter with the highest expected information for a GameState."""
+        pattern, tried = self.pattern(game)
+        return self.best(pattern, tried)[0]
+
+_solvers = {}
+
+def solver(bank, mode=None):
+    mode = mode or MATCH_MODE
+    sv = _solvers.get((bank.version, mode))
+    if sv is None or sv.bank is not bank:
+        sv = _solvers[bank.version, mode] = Solver(bank, mode)
+    return sv
+
+#  BALANCING
+#
+#  simulate() plays bot games on GameState over a process pool and reports
+#  win rate, points and the time-bonus share per language and difficulty,
+#  plus per-word tallies.  Games run in batches, each with a Random seeded
+#  from (seed, lang, difficulty, batch), and batches are merged in order, so
+#  a seed gives the same report whatever the worker count.  Strategies pick
+#  letters and think-time models give seconds per pick; both are looked up
+#  by name so they cross into workers, and more can be added to the dicts.
+
+SIM_BATCH = 2000        # games per worker task
+SIM_BUCKET = 10         # points histogram bucket width
+
+def _pick_solver(bank, rng):
+    return solver(bank).suggest
+
+def _pick_noisy(bank, rng, slip=0.25):
+    # the solver, except that a quarter of picks are a random untried letter
+    best, anyl = _pick_solver(bank, rng), _pick_random(bank, rng)
+    return lambda game: anyl(game) if rng.random() < slip else best(game)
+
+def _pick_frequency(bank, rng):
+    sv = solver(bank)
+    order = [(letter_bit(k), sv.alphabet[k]) for k in sv.by_frequency()]
+
+    def pick(game):
+        for bit, ch in order:
+            if not game.guessed & bit:
+                return ch
+    return pick
+
+def _pick_random(bank, rng):
+    sv = solver(bank)
+    keys = [(letter_bit(k), ch) for k, ch in sv.alphabet.items()]
+
+    def pick(game):
+        left = [ch for bit, ch in keys if not game.guessed & bit]
+        return rng.choice(left) if left else None
+    return pick
+
+STRATEGIES = {'solver': _pick_solver, 'noisy': _pick_noisy,
+              'frequency': _pick_frequency, 'random': _pick_random}
+
+THINK_MODELS = {
+    'instant': lambda rng: 0.0,
+    'steady': lambda rng: 4.0,
+    'human': lambda rng: rng.lognormvariate(1.3, 0.6),     # median ~3.7s, long tail
+}
+
+def play_bot(word, lang, difficulty, pick, think, rng):
+    """Play one headless game; returns GameState.result()."""
+    game = GameState(word, lang, difficulty)
+    now = 0.0
+    while True:
+        now += think(rng)
+        game.tick(now)
+        if game.outcome:
+            break
+        ch = pick(game)
+        if ch is None:
+            game.quit()
+            break
+        game.guess(ch)
+    return game.result()
+
+def _sim_batch(lang, difficulty, strategy, think, draw, seed, batch, n):
+    # runs in a worker process
+    bank = word_bank(lang)
+    rng = random.Random(f'{seed}/{lang}/{difficulty}/{batch}')
+    pick = STRATEGIES[strategy](bank, rng)
+    think = THINK_MODELS[think]
+    tier = difficulty if draw == 'tier' else None
+    tries = DIFFICULTY[difficulty]['tries']
+    hist, words = collections.Counter(), {}
+    wins = points = time_bonus = 0
+    for _ in range(n):
+        i = bank.draw(rng, tier)
+        res = play_bot(bank[i]['w'].lower(), lang, difficulty, pick, think, rng)
+        wins += res['won']
+        points += res['points']
+        time_bonus += res['time_bonus']
+        hist[res['points'] // SIM_BUCKET] += 1
+        # per word: games, wins, difficulty sum (1 per loss, mistake share per win), points
+        t = words.get(i)
+        if t is None:
+            t = words[i] = [0, 0, 0.0, 0]
+        t[0] += 1
+        t[1] += res['won']
+        t[2] += res['mistakes'] / tries if res['won'] else 1.0
+        t[3] += res['points']
+    return {'games': n, 'wins': wins, 'points': points, 'time_bonus': time_bonus,
+            'hist': hist, 'words': words}
+
+def _hist_quantile(hist, q):
+    total, seen = sum(hist.values()), 0
+    for b in sorted(hist):
+        seen += hist[b]
+        if seen >= q * total:
+            return b * SIM_BUCKET
+    return 0
+
+def simulate(games, langs=('en', 'ar'), difficulties=TIERS, strategy='solver', think='human',
+             seed=0, workers=None, draw='tier', specs=()):
+    """Play `games` bot games per (language, difficulty); returns a report dict."""
+    jobs = [(lang, d, strategy, think, draw, seed, b, min(SIM_BATCH, games - k))
+            for lang in langs for d in difficulties
+            for b, k in enumerate(range(0, games, SIM_BATCH))]
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [_sim_batch(*job) for job in jobs]
+    else:
+        workers = workers or os.cpu_count() or 1
+        init, args = (load_word_banks, (list(specs),)) if specs else (None, ())
+        with concurrent.futures.ProcessPoolExecutor(workers, initializer=init, initargs=args) as pool:
+            results = list(pool.map(_sim_batch, *zip(*jobs)))
+    secs = time.perf_counter() - t0
+    cells, words = {}, {lang: {} for lang in langs}
+    for job, r in zip(jobs, results):
+        c = cells.setdefault((job[0], job[1]), {'games': 0, 'wins': 0, 'points': 0,
+                                                'time_bonus': 0, 'hist': collections.Counter()})
+        for k in ('games', 'wins', 'points', 'time_bonus'):
+            c[k] += r[k]
+        c['hist'].update(r['hist'])
+        per_word = words[job[0]]
+        for i, t in r['words'].items():
+            acc = per_word.setdefault(i, [0, 0, 0.0, 0])
+            for k in range(4):
+                acc[k] += t[k]
+    for c in cells.values():
+        n = c['games'] or 1
+        c['win_rate'] = c['wins'] / n
+        c['mean_points'] = c['points'] / n
+        c['time_share'] = c['time_bonus'] / c['points'] if c['points'] > 0 else 0.0
+        c['p10'], c['p50'], c['p90'] = (_hist_quantile(c['hist'], q) for q in (0.1, 0.5, 0.9))
+    total = sum(c['games'] for c in cells.values())
+    return {'cells': cells, 'words': words, 'games': total, 'seconds': secs,
+            'games_per_sec': total / secs if secs else 0.0, 'workers': workers, 'seed': seed}
+
+def word_difficulty(report, lang, min_games=10):
+    """Measured difficulty (0 easy .. 1 hard) of each word index with enough games."""
+    return {i: t[2] / t[0] for i, t in report['words'][lang].items() if t[0] >= min_games}
+
+def with_difficulty(bank, scores):
+    """A copy of bank whose entries carry measured difficulty 'd' from scores."""
+    entries = []
+    for i in range(len(bank)):
+        e = dict(bank[i])
+        if i in scores:
+            e['d'] = round(scores[i], 4)
+        entries.append(e)
+    return WordBank(bank.lang, entries, source=bank.source)
+
+def save_word_bank(bank, path):
+    """Write bank as NDJSON (readable back with --words / import-words)."""
+    lines = (json.dumps(bank[i], ensure_ascii=False, separators=(',', ':')) for i in range(len(bank)))
+    _atomic_write_json(path, ''.join(line + '\n' for line in lines))
+
 #  PERSISTENCE (JSON)
 #
 
 PLAYER_FILE = 'hangman_players.json'
-DAILY_FILE  = 'hangman_daily.json'
+DB_FILE     = 'hangman_players.db'
+STORAGE     = os.environ.get('HANGMAN_STORAGE', 'json')   # json | sqlite | sharded | journal
+SHARD_DIR   = 'hangman_players.d'
+SHARD_COUNT = 256
+LEADERBOARD_FILE = 'hangman_leaderboard.json'
+LEADERBOARD_K = 10
+LEADERBOARD_CAPACITY = 50
 
 DEFAULT_STATS = {
     'points': 0,
@@ -665,71 +2540,890 @@ DEFAULT_STATS = {
     'unlocked': []
 }
 
-def load_players():
+FLUSH_DELAY = 2.0       # quiet period before dirty players are written
+FLUSH_MAX_DELAY = 15.0  # upper bound while updates keep arriving
+
+_ACH_BIT = {a['id']: i for i, a in enumerate(ACHIEVEMENTS)}
+
+class PlayerStats:
+    """One player's stats in slots, with unlocked achievements as a bitset.
+
+    Behaves like the DEFAULT_STATS dict (stats['wins'], .get, .items, ...),
+    so existing code and the JSON files keep working; to_dict()/from_dict()
+    convert losslessly, with unlocked ids returned in ACHIEVEMENTS order.
+    Keys outside DEFAULT_STATS are kept in `extra` and survive to_dict().
+    """
+    FIELDS = tuple(k for k in DEFAULT_STATS if k != 'unlocked')
+    __slots__ = FIELDS + ('bits', 'other_ach', 'extra')
+
+    def __init__(self):
+        for k in self.FIELDS:
+            setattr(self, k, DEFAULT_STATS[k])
+        self.bits = 0
+        self.other_ach = ()     # unlocked ids this version does not know
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, d):
+        if isinstance(d, cls):
+            return d
+        st = cls()
+        for k, v in d.items():
+            st[k] = v
+        return st
+
+    def to_dict(self):
+        d = {k: getattr(self, k) for k in self.FIELDS}
+        d['unlocked'] = self.unlocked_ids()
+        if self.extra:
+            d.update(self.extra)
+            if isinstance(d.get('seen'), dict):
+                d['seen'] = {lang: st.state() if isinstance(st, SeenWords) else st
+                             for lang, st in d['seen'].items()}
+        return d
+
+    # achievements
+    def has(self, ach_id):
+        try:
+            return bool(self.bits >> _ACH_BIT[ach_id] & 1)
+        except KeyError:
+            return ach_id in self.other_ach
+
+    def unlock(self, ach_id):
+        bit = _ACH_BIT.get(ach_id)
+        if bit is not None:
+            self.bits |= 1 << bit
+        elif ach_id not in self.other_ach:
+            self.other_ach += (ach_id,)
+
+    @property
+    def n_unlocked(self):
+        return bin(self.bits).count('1') + len(self.other_ach)
+
+    def unlocked_ids(self):
+        return [a['id'] for a in ACHIEVEMENTS if self.bits >> _ACH_BIT[a['id']] & 1] + list(self.other_ach)
+
+    # dict protocol
+    def __getitem__(self, k):
+        if k in DEFAULT_STATS:
+            return self.unlocked_ids() if k == 'unlocked' else getattr(self, k)
+        if self.extra and k in self.extra:
+            return self.extra[k]
+        raise KeyError(k)
+
+    def __setitem__(self, k, v):
+        if k == 'unlocked':
+            self.bits, self.other_ach = 0, ()
+            for ach_id in v:
+                self.unlock(ach_id)
+        elif k in DEFAULT_STATS:
+            setattr(self, k, v)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[k] = v
+
+    def __contains__(self, k):
+        return k in DEFAULT_STATS or bool(self.extra and k in self.extra)
+
+    def __eq__(self, other):
+        if isinstance(other, (PlayerStats, dict)):
+            return self.to_dict() == (other.to_dict() if isinstance(other, PlayerStats) else other)
+        return NotImplemented
+
+    def get(self, k, default=None):
+        try:
+            return self[k]
+        except KeyError:
+            return default
+
+    def setdefault(self, k, default=None):
+        if k not in self:
+            self[k] = default
+        return self[k]
+
+    def keys(self):
+        return self.to_dict().keys()
+
+    def items(self):
+        return self.to_dict().items()
+
+    def update(self, other):
+        for k, v in other.items():
+            self[k] = v
+
+    def clear(self):
+        self.__init__()
+
+    def copy(self):
+        return PlayerStats.from_dict(self.to_dict())
+
+    def __repr__(self):
+        return f'PlayerStats({self.to_dict()!r})'
+
+def _json_default(obj):
+    if isinstance(obj, PlayerStats):
+        return obj.to_dict()
+    raise TypeError(f'{type(obj).__name__} is not JSON serializable')
+
+def _atomic_write_json(path, data):
+    # write a sibling temp file and rename it over the target, so a crash
+    # leaves either the old file or the new one, never a truncated one
+    folder = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix='.' + os.path.basename(path), suffix='.tmp')
     try:
-        with open(PLAYER_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(data if isinstance(data, str) else
+                    json.dumps(data, ensure_ascii=False, separators=(',', ':'),
+                               default=_json_default))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+class LeaderboardIndex:
+    """Top players by points, maintained incrementally as players are saved.
 
-def save_players(players):
-    with open(PLAYER_FILE, 'w', encoding='utf-8') as f:
-        json.dump(players, f, ensure_ascii=False, indent=2)
+    Holds up to `capacity` rows (more than the K shown, so a few players
+    dropping down does not invalidate it) and `floor`, an upper bound on the
+    points of every player not held (None: every player is held).  top(k) is
+    answerable from the index alone while its k-th row is >= floor.
+    """
+    FIELDS = ('points', 'wins', 'losses', 'streak', 'unlocked')
+
+    def __init__(self, path=LEADERBOARD_FILE, capacity=LEADERBOARD_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.rows = {}
+        self.floor = None
+        self.valid = False
+
+    def load(self, source_path):
+        # trust the saved index only if the player file is the one it was built from
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.rows = data['rows']
+            self.floor = data['floor']
+            self.valid = data.get('source') == self._fingerprint(source_path)
+        except (OSError, ValueError, KeyError):
+            self.rows, self.floor, self.valid = {}, None, False
+        return self.valid
+
+    @staticmethod
+    def _fingerprint(path):
+        if path is None:
+            return None
+        try:
+            st = os.stat(path)
+            return [st.st_size, st.st_mtime_ns]
+        except OSError:
+            return None
+
+    def save(self, source_path):
+        _atomic_write_json(self.path, {'floor': self.floor, 'rows': self.rows,
+                                       'source': self._fingerprint(source_path)})
+
+    def _row(self, stats):
+        return {k: stats.get(k, DEFAULT_STATS[k]) for k in self.FIELDS}
+
+    def rebuild(self, players):
+        best = heapq.nlargest(self.capacity + 1, players.items(),
+                              key=lambda x: x[1].get('points', 0))
+        self.rows = {name: self._row(st) for name, st in best[:self.capacity]}
+        self.floor = best[self.capacity][1].get('points', 0) if len(best) > self.capacity else None
+        self.valid = True
+
+    def update(self, name, stats):
+        row = self._row(stats)
+        if name not in self.rows and self.floor is not None and row['points'] <= self.floor:
+            return                       # still below everything we hold
+        self.rows[name] = row
+        if len(self.rows) > self.capacity:
+            low = min(self.rows, key=lambda n: self.rows[n]['points'])
+            pts = self.rows.pop(low)['points']
+            self.floor = pts if self.floor is None else max(self.floor, pts)
+
+    def top(self, k=LEADERBOARD_K):
+        if not self.valid:
+            return None
+        ranked = sorted(self.rows.items(), key=lambda x: x[1]['points'], reverse=True)[:k]
+        if self.floor is not None and (len(ranked) < k or ranked[-1][1]['points'] < self.floor):
+            return None                  # someone outside the index may rank higher
+        return ranked
+
+    def check(self, players, k=LEADERBOARD_K):
+        """Compare against a full sort; rebuild and return False on mismatch."""
+        full = sorted(players.items(), key=lambda x: x[1].get('points', 0), reverse=True)[:k]
+        got = self.top(k)
+        ok = got is not None and [r['points'] for _, r in got] == [st.get('points', 0) for _, st in full]
+        if not ok:
+            self.rebuild(players)
+        return ok
+
+class PlayerStore:
+    """All players in memory; changes are written behind in debounced batches."""
+
+    def __init__(self, path=PLAYER_FILE, delay=FLUSH_DELAY):
+        self.path = path
+        self.delay = delay
+        self.flushes = 0
+        self._players = None
+        self._dirty = set()
+        self._dirty_since = None
+        self._timer = None
+        self._lock = threading.RLock()
+        self.index = LeaderboardIndex(LEADERBOARD_FILE)
+        self.index.load(path)
+
+    def _data(self):
+        if self._players is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._players = {name: PlayerStats.from_dict(d)
+                                     for name, d in json.load(f).items()}
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._players = {}
+        return self._players
+
+    def all(self):
+        with self._lock:
+            return dict(self._data())
+
+    def get(self, name):
+        with self._lock:
+            players = self._data()
+            if name not in players:
+                players[name] = PlayerStats()
+                self.index.update(name, players[name])
+                self._mark(name)
+            return players[name]
+
+    def put(self, name, stats):
+        with self._lock:
+            self._data()[name] = stats
+            self.index.update(name, stats)
+            self._mark(name)
+
+    def _mark(self, name):
+        self._dirty.add(name)
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        if self._timer:
+            self._timer.cancel()
+        wait = min(self.delay, max(0.0, self._dirty_since + FLUSH_MAX_DELAY - now))
+        self._timer = threading.Timer(wait, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def apply(self, name, stats, rec):
+        with self._lock:
+            new = apply_record(stats, rec)
+            self.put(name, stats)
+            return new
+
+    def top(self, k=LEADERBOARD_K):
+        with self._lock:
+            ranked = self.index.top(k)
+            if ranked is None:
+                self.index.rebuild(self._data())
+                ranked = self.index.top(k)
+            return ranked
+
+    def check_index(self):
+        with self._lock:
+            return self.index.check(self._data())
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            payload = json.dumps(self._players, ensure_ascii=False, separators=(',', ':'),
+                                 default=_json_default)
+            try:
+                _atomic_write_json(self.path, payload)
+            except OSError:
+                # still dirty: try again after another quiet period
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+                raise
+            self._dirty.clear()
+            self._dirty_since = None
+            if self.index.valid:
+                self.index.save(self.path)
+            self.flushes += 1
+
+class SqliteStore:
+    """One row per player in SQLite (WAL), with indexed leaderboard columns."""
+    COLUMNS = ('points', 'wins', 'losses', 'streak')
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        with self._db:
+            self._db.execute(
+                'CREATE TABLE IF NOT EXISTS players ('
+                ' name TEXT PRIMARY KEY,'
+                ' points INTEGER NOT NULL DEFAULT 0,'
+                ' wins INTEGER NOT NULL DEFAULT 0,'
+                ' losses INTEGER NOT NULL DEFAULT 0,'
+                ' streak INTEGER NOT NULL DEFAULT 0,'
+                ' stats TEXT NOT NULL)')
+            for col in ('points', 'wins', 'streak'):
+                self._db.execute(f'CREATE INDEX IF NOT EXISTS players_{col} ON players({col} DESC)')
+
+    def _row(self, name, stats):
+        return (name, *(int(stats.get(c, 0)) for c in self.COLUMNS),
+                json.dumps(stats, ensure_ascii=False, separators=(',', ':'),
+                           default=_json_default))
+
+    def _write(self, rows):
+        with self._lock, self._db:
+            self._db.executemany(
+                'INSERT OR REPLACE INTO players (name, points, wins, losses, streak, stats)'
+                ' VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def all(self):
+        with self._lock:
+            rows = self._db.execute('SELECT name, stats FROM players').fetchall()
+        return {name: PlayerStats.from_dict(json.loads(st)) for name, st in rows}
+
+    def get(self, name):
+        with self._lock:
+            row = self._db.execute('SELECT stats FROM players WHERE name = ?', (name,)).fetchone()
+        if row:
+            return PlayerStats.from_dict(json.loads(row[0]))
+        stats = PlayerStats()
+        with self._lock, self._db:
+            # IGNORE: another session may have created the player meanwhile
+            self._db.execute('INSERT OR IGNORE INTO players (name, points, wins, losses, streak, stats)'
+                             ' VALUES (?, ?, ?, ?, ?, ?)', self._row(name, stats))
+        return stats
+
+    def put(self, name, stats):
+        self._write([self._row(name, stats)])
+
+    def apply(self, name, stats, rec):
+        # read-modify-write inside one IMMEDIATE transaction, so sessions
+        # finishing games at the same time cannot overwrite each other
+        with self._lock:
+            self._db.execute('BEGIN IMMEDIATE')
+            try:
+                row = self._db.execute('SELECT stats FROM players WHERE name = ?', (name,)).fetchone()
+                fresh = PlayerStats.from_dict(json.loads(row[0])) if row else stats
+                new = apply_record(fresh, rec)
+                self._db.execute(
+                    'INSERT OR REPLACE INTO players (name, points, wins, losses, streak, stats)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)', self._row(name, fresh))
+                self._db.execute('COMMIT')
+            except BaseException:
+                self._db.execute('ROLLBACK')
+                raise
+        if fresh is not stats:
+            stats.update(fresh)
+        return new
+
+    def top(self, k=LEADERBOARD_K):
+        with self._lock:
+            rows = self._db.execute('SELECT name, stats FROM players'
+                                    ' ORDER BY points DESC LIMIT ?', (k,)).fetchall()
+        return [(name, json.loads(st)) for name, st in rows]
+
+    def flush(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def import_json_players(json_path=PLAYER_FILE, db_path=DB_FILE):
+    """One-shot copy of a hangman_players.json file into the SQLite store."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        players = json.load(f)
+    db = SqliteStore(db_path)
+    db._write([db._row(name, st) for name, st in players.items()])
+    db.close()
+    return len(players)
+
+class JournalStore:
+    """Players as a fold over the game journal, checkpointed by snapshots.
+
+    put() only updates memory: the journal record written by record_game()
+    is what persists a game.  Meant for a single game process.
+    """
+
+    def __init__(self, journal):
+        self.journal = journal
+        self._players = journal.fold()[0]
+        self._lock = threading.Lock()
+
+    def all(self):
+        with self._lock:
+            return dict(self._players)
+
+    def get(self, name):
+        with self._lock:
+            if name not in self._players:
+                self._players[name] = PlayerStats()
+            return self._players[name]
+
+    def put(self, name, stats):
+        with self._lock:
+            self._players[name] = stats
+
+    def apply(self, name, stats, rec):
+        with self._lock:
+            self._players[name] = stats
+            return apply_record(stats, rec)
+
+    def top(self, k=LEADERBOARD_K):
+        with self._lock:
+            return heapq.nlargest(k, self._players.items(), key=lambda x: x[1].get('points', 0))
+
+    def snapshot(self):
+        # players folded so far are exactly the journal up to its current end
+        with self._lock:
+            segs = self.journal.segments()
+            if segs:
+                seg = segs[-1]
+                pos = (seg, os.path.getsize(os.path.join(self.journal.folder, seg)))
+                self.journal.snapshot(self._players, pos)
+
+    def flush(self):
+        self.snapshot()
+
+class ShardedStore:
+    """Players hashed into SHARD_COUNT small JSON files under SHARD_DIR.
+
+    Every shard has its own fcntl lock file, so a session only reads and
+    writes its own player's shard and concurrent sessions on other players
+    never contend.  Games are applied to the copy on disk under the lock
+    (see apply), so two sessions of the same player do not lose updates
+    either.  Each shard also keeps its own top-K rows in a `.top` file,
+    rewritten under the same lock as the shard; top() merges them.
+    """
+
+    def __init__(self, folder=SHARD_DIR, shards=SHARD_COUNT):
+        self.folder = folder
+        self.shards = shards
+        os.makedirs(folder, exist_ok=True)
+
+    def _shard(self, name):
+        h = int.from_bytes(hashlib.blake2b(name.encode('utf-8'), digest_size=4).digest(), 'big')
+        return f'{h % self.shards:04x}'
+
+    @contextlib.contextmanager
+    def _locked(self, key, exclusive=True):
+        with open(os.path.join(self.folder, key + '.lock'), 'a+') as lf:
+            if fcntl is not None:
+                fcntl.flock(lf, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+
+    def _path(self, key):
+        return os.path.join(self.folder, key + '.json')
+
+    def _read(self, key):
+        # a damaged shard raises: writing back {} would drop its other players
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _write_top(self, key, players):
+        best = heapq.nlargest(LEADERBOARD_K, players.items(), key=lambda x: x[1].get('points', 0))
+        _atomic_write_json(os.path.join(self.folder, key + '.top'),
+                           [[name, {k: st.get(k, DEFAULT_STATS[k]) for k in LeaderboardIndex.FIELDS}]
+                            for name, st in best])
+
+    def _update(self, name, fn):
+        key = self._shard(name)
+        with self._locked(key):
+            players = self._read(key)
+            result = fn(players)
+            _atomic_write_json(self._path(key), players)
+            self._write_top(key, players)
+        return result
+
+    def get(self, name):
+        with self._locked(self._shard(name), exclusive=False):
+            stats = self._read(self._shard(name)).get(name)
+        return PlayerStats.from_dict(stats) if stats is not None else PlayerStats()
+
+    def put(self, name, stats):
+        self._update(name, lambda players: players.__setitem__(name, stats))
+
+    def apply(self, name, stats, rec):
+        def _apply(players):
+            fresh = PlayerStats.from_dict(players[name]) if name in players else stats
+            players[name] = fresh
+            return fresh, apply_record(fresh, rec)
+        fresh, new = self._update(name, _apply)
+        if fresh is not stats:
+            stats.update(fresh)
+        return new
+
+    def all(self):
+        players = {}
+        for f in os.listdir(self.folder):
+            if f.endswith('.json') and not f.startswith('_'):
+                with self._locked(f[:-5], exclusive=False):
+                    for name, d in self._read(f[:-5]).items():
+                        players[name] = PlayerStats.from_dict(d)
+        return players
+
+    def _top(self, key):
+        try:
+            with open(os.path.join(self.folder, key + '.top'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        with self._locked(key):         # a shard written before .top files existed
+            self._write_top(key, self._read(key))
+        return self._top(key)
+
+    def top(self, k=LEADERBOARD_K):
+        rows = []
+        for f in os.listdir(self.folder):
+            if f.endswith('.json') and not f.startswith('_'):
+                rows.extend(self._top(f[:-5]))
+        return [tuple(r) for r in heapq.nlargest(k, rows, key=lambda r: r[1]['points'])]
+
+    def flush(self):
+        pass
+
+_players_store = None
+
+def _store():
+    global _players_store
+    if _players_store is None:
+        if STORAGE == 'sqlite':
+            _players_store = SqliteStore(DB_FILE)
+        elif STORAGE == 'sharded':
+            _players_store = ShardedStore(SHARD_DIR, SHARD_COUNT)
+        elif STORAGE == 'journal':
+            _players_store = JournalStore(_journal())
+        else:
+            _players_store = PlayerStore(PLAYER_FILE, FLUSH_DELAY)
+        atexit.register(_players_store.flush)
+    return _players_store
+
+def load_players():
+    return _store().all()
 
 def get_player(name):
-    players = load_players()
-    if name not in players:
-        players[name] = DEFAULT_STATS.copy()
-    # ensure all keys exist
-    for k, v in DEFAULT_STATS.items():
-        players[name].setdefault(k, v)
-    save_players(players)
-    return players[name]
-
-def save_player(name, stats):
-    players = load_players()
-    players[name] = stats
-    save_players(players)
+    return _store().get(name)
 
 def check_achievements(stats):
     new = []
     for ach in ACHIEVEMENTS:
-        if ach['id'] not in stats['unlocked'] and ach['cond'](stats):
-            stats['unlocked'].append(ach['id'])
+        if not stats.has(ach['id']) and ach['cond'](stats):
+            stats.unlock(ach['id'])
             new.append(ach)
     return new
 
-def daily_challenge():
-    try:
-        with open(DAILY_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        if data.get('date') == datetime.date.today().isoformat():
-            return data
-    except (FileNotFoundError, json.JSONDecodeError):
-        pass
-    lang = random.choice(['ar', 'en'])
-    word = random.choice(AR_WORDS if lang == 'ar' else EN_WORDS)
-    challenge = {
-        'date': datetime.date.today().isoformat(),
+def game_record(user, lang, difficulty, word, outcome, mistakes, elapsed, points, hint,
+                index=None, version=None):
+    rec = {'k': 'game', 't': round(time.time(), 3), 'u': user, 'l': lang,
+           'd': difficulty, 'w': word, 'o': outcome, 'm': mistakes,
+           'e': round(elapsed, 3), 'p': points, 'h': hint}
+    if index is not None:
+        rec['i'], rec['v'] = index, version     # word-bank index, for the seen set
+    return rec
+
+def bonus_record(user, points, reason):
+    return {'k': 'bonus', 't': round(time.time(), 3), 'u': user, 'p': points, 'r': reason}
+
+def apply_game_result(stats, rec):
+    """Fold one finished game into a player's stats; returns new achievements.
+
+    play_game and the journal replay both go through here, so live stats and
+    stats rebuilt from the journal cannot drift apart.
+    """
+    won = rec['o'] == 'win'
+    elapsed = rec['e']
+    stats['points'] += rec['p']
+    if won:
+        stats['wins'] += 1
+        stats['streak'] += 1
+        stats['best_streak'] = max(stats['streak'], stats.get('best_streak', 0))
+        stats['perfect'] = (rec['m'] == 0)
+        stats['loss_streak'] = 0
+        if elapsed < stats.get('best_t', 999):
+            stats['best_t'] = elapsed
+        if rec['l'] == 'ar':
+            stats['wins_ar'] += 1
+        else:
+            stats['wins_en'] += 1
+        if not rec['h']:
+            stats['wnh'] += 1
+    else:
+        stats['losses'] += 1
+        stats['streak'] = 0
+        stats['perfect'] = False
+        stats['loss_streak'] = stats.get('loss_streak', 0) + 1
+    # comeback achievement
+    if won and stats.get('loss_streak', 0) >= 3:
+        stats['comeback'] = True
+    stats['total_games'] += 1
+    stats['total_time'] += elapsed
+    if 'i' in rec:
+        mark_seen(stats, rec['l'], rec['i'], rec['v'])
+    return check_achievements(stats)
+
+def apply_bonus(stats, rec):
+    stats['points'] += rec['p']
+
+def apply_record(stats, rec):
+    if rec['k'] == 'game':
+        return apply_game_result(stats, rec)
+    apply_bonus(stats, rec)
+    return []
+
+#  GAME JOURNAL
+#
+#  Every finished game (and every bonus) is appended as one JSON line to the
+#  current segment in JOURNAL_DIR.  A snapshot stores all players folded up to
+#  a (segment, offset) position, so rebuilding stats only replays the tail.
+#  compact() merges the sealed segments before the snapshot into one file.
+
+JOURNAL_DIR = 'hangman_journal'
+JOURNAL_SEGMENT_BYTES = 4 << 20
+SNAPSHOT_EVERY = 500        # appends between automatic snapshots
+
+class GameJournal:
+    SNAPSHOT = 'snapshot.json'
+
+    def __init__(self, folder=JOURNAL_DIR):
+        self.folder = folder
+        self.appends = 0
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+    def segments(self):
+        return sorted(f for f in os.listdir(self.folder)
+                      if f.startswith('seg-') and f.endswith('.log'))
+
+    def _current(self):
+        segs = self.segments()
+        if segs and os.path.getsize(os.path.join(self.folder, segs[-1])) < JOURNAL_SEGMENT_BYTES:
+            return segs[-1]
+        nxt = int(segs[-1][4:12]) + 1 if segs else 1
+        return f'seg-{nxt:08d}.log'
+
+    def append(self, rec):
+        line = (json.dumps(rec, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+        with self._lock:
+            with open(os.path.join(self.folder, self._current()), 'a+b') as f:
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b'\n':
+                        self._cut_torn(f, end)
+                f.write(line)
+            self.appends += 1
+
+    @staticmethod
+    def _cut_torn(f, end):
+        # drop a final line torn by a crash, so the next record starts on its own line
+        pos = end
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            i = f.read(step).rfind(b'\n')
+            if i >= 0:
+                f.truncate(pos - step + i + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+    def records(self, start=None):
+        """Yield (segment, end offset, record) after the (segment, offset) start."""
+        seg0, off0 = start or ('', 0)
+        for seg in self.segments():
+            if seg < seg0:
+                continue
+            with open(os.path.join(self.folder, seg), 'rb') as f:
+                if seg == seg0:
+                    f.seek(off0)
+                for line in iter(f.readline, b''):
+                    if not line.endswith(b'\n'):
+                        break                 # torn final write
+                    yield seg, f.tell(), json.loads(line)
+
+    def load_snapshot(self):
+        try:
+            with open(os.path.join(self.folder, self.SNAPSHOT), 'r', encoding='utf-8') as f:
+                snap = json.load(f)
+            return (snap['seg'], snap['off']), snap['players']
+        except (OSError, ValueError, KeyError):
+            return None, {}
+
+    def fold(self):
+        """Return ({name: stats}, position) for the whole journal."""
+        pos, players = self.load_snapshot()
+        players = {name: PlayerStats.from_dict(d) for name, d in players.items()}
+        for seg, off, rec in self.records(pos):
+            st = players.get(rec['u'])
+            if st is None:
+                st = players[rec['u']] = PlayerStats()
+            apply_record(st, rec)
+            pos = (seg, off)
+        return players, pos
+
+    def snapshot(self, players=None, pos=None):
+        if players is None:
+            players, pos = self.fold()
+        if pos is None:
+            return
+        _atomic_write_json(os.path.join(self.folder, self.SNAPSHOT),
+                           {'seg': pos[0], 'off': pos[1], 'players': players})
+
+    def compact(self):
+        """Merge sealed segments older than the snapshot into one file."""
+        pos, _ = self.load_snapshot()
+        if pos is None:
+            return 0
+        old = [s for s in self.segments() if s < pos[0]]
+        if len(old) < 2:
+            return 0
+        target = os.path.join(self.folder, old[0])
+        fd, tmp = tempfile.mkstemp(dir=self.folder, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as out:
+            for seg in old:
+                with open(os.path.join(self.folder, seg), 'rb') as f:
+                    shutil.copyfileobj(f, out)
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, target)
+        for seg in old[1:]:
+            os.remove(os.path.join(self.folder, seg))
+        return len(old)
+
+_game_journal = None
+
+def _journal():
+    global _game_journal
+    if _game_journal is None:
+        _game_journal = GameJournal(JOURNAL_DIR)
+    return _game_journal
+
+def record_game(rec):
+    j = _journal()
+    j.append(rec)
+    if STORAGE == 'journal' and j.appends % SNAPSHOT_EVERY == 0:
+        _store().snapshot()
+
+def commit_record(user, stats, rec):
+    """Apply a game/bonus record to the player through the store and journal it.
+
+    Returns newly unlocked achievements.  Stores shared between processes
+    apply the record to the stored copy, and `stats` is refreshed from it.
+    A server worker's RemoteStore leaves the journal to the coordinator.
+    """
+    store = _store()
+    new = store.apply(user, stats, rec)
+    if not isinstance(store, RemoteStore):
+        record_game(rec)
+    return new
+
+# The daily word is a pure function of the date and the word-bank version,
+# so every machine and session agrees on it without reading or writing files.
+
+def word_bank_version():
+    return hashlib.sha256(f"ar:{word_bank('ar').version}:en:{word_bank('en').version}"
+                          .encode()).hexdigest()[:16]
+
+@functools.lru_cache(maxsize=4096)
+def _daily_picks(date, version):
+    # the day's first pick and a distinct second one, as (lang, index)
+    picks = []
+    k = 0
+    while len(picks) < 2:
+        tag = f'hangman-daily:{version}:{date.isoformat()}' + (f':{k}' if k else '')
+        n = int.from_bytes(hashlib.sha256(tag.encode()).digest()[:8], 'big')
+        lang = 'ar' if n & 1 else 'en'
+        pick = (lang, (n >> 1) % len(word_bank(lang)))
+        if pick not in picks:
+            picks.append(pick)
+        k += 1
+    return tuple(picks)
+
+def daily_challenge(date=None, version=None):
+    """The day's first pick, or its second if the first was yesterday's word.
+
+    Only one word is ever excluded, so every day's word is one of its two
+    picks and a day whose first pick is neither of yesterday's needs no
+    further look-back; otherwise walk back to such a day and replay forward.
+    """
+    date = date or datetime.date.today()
+    version = version or word_bank_version()
+    chain = [date]
+    while _daily_picks(chain[-1], version)[0] in _daily_picks(chain[-1] - datetime.timedelta(days=1), version):
+        chain.append(chain[-1] - datetime.timedelta(days=1))
+    pick = _daily_picks(chain.pop(), version)[0]
+    for day in reversed(chain):
+        first, second = _daily_picks(day, version)
+        pick = second if first == pick else first
+    lang, i = pick
+    word = word_bank(lang)[i]
+    return {
+        'date': date.isoformat(),
         'lang': lang,
         'w': word['w'],
         'h': word['h'],
         'cat': word.get('cat', '?')
     }
-    with open(DAILY_FILE, 'w', encoding='utf-8') as f:
-        json.dump(challenge, f, ensure_ascii=False, indent=2)
-    return challenge
+
+def daily_calendar(start=None, days=30):
+    start = start or datetime.date.today()
+    version = word_bank_version()
+    return [daily_challenge(start + datetime.timedelta(days=i), version) for i in range(days)]
+
+def validate_calendar(calendar):
+    """Check a (possibly foreign) calendar against this bank; returns problems."""
+    version = word_bank_version()
+    known = {(lang, w) for lang in ('ar', 'en') for w in word_bank(lang).words()}
+    problems = []
+    prev = None
+    for entry in calendar:
+        day = datetime.datetime.strptime(entry['date'], '%Y-%m-%d').date()
+        if entry != daily_challenge(day, version):
+            problems.append(f"{entry['date']}: differs from this word bank ({version})")
+        if (entry['lang'], entry['w']) not in known:
+            problems.append(f"{entry['date']}: unknown word {entry['w']!r}")
+        if prev and prev['w'] == entry['w']:
+            problems.append(f"{entry['date']}: same word as the day before")
+        prev = entry
+    return problems
 
 #  SCREENS (achievements, leaderboard, stats)
 #
 
-def show_achievements(stats, lang):
+def show_achievements(stats, lang, wait=True):
     clear()
     w = term_width()
     hline('═', YL, w)
     center_print(f"{YL}🏆  {'ACHIEVEMENTS' if lang=='en' else 'الإنجازات'}{R}", w)
     hline('═', YL, w)
-    unlocked = len(stats['unlocked'])
+    unlocked = stats.n_unlocked
     total = len(ACHIEVEMENTS)
     print(f"\n  {progress_bar(unlocked, total, 28)}  {CY}{unlocked}/{total}{R}\n")
 
@@ -737,7 +3431,7 @@ def show_achievements(stats, lang):
     left  = []
     right = []
     for i, ach in enumerate(ACHIEVEMENTS):
-        ul = ach['id'] in stats['unlocked']
+        ul = stats.has(ach['id'])
         icon = ach['icon'] if ul else '🔒'
         status = f"{HIGR} ✔ {R}" if ul else f"{GY} · {R}"
         name = ach['en'] if lang=='en' else ach['ar']
@@ -756,20 +3450,21 @@ def show_achievements(stats, lang):
             print(l)
 
     hline('─', GY, w)
-    input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
+    if wait:
+        input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
 
-def show_leaderboard(lang):
+def show_leaderboard(lang, wait=True, ranked=None):
     clear()
     w = term_width()
     hline('═', MG, w)
     center_print(f"{MG}🏅  {'LEADERBOARD — Top 10' if lang=='en' else 'قادة النقاط — أفضل 10'}{R}", w)
     hline('═', MG, w)
 
-    players = load_players()
-    if not players:
+    if ranked is None:
+        ranked = _store().top(LEADERBOARD_K)
+    if not ranked:
         print(f"\n  {GY}{'No players yet.' if lang=='en' else 'لا يوجد لاعبون بعد.'}{R}")
     else:
-        ranked = sorted(players.items(), key=lambda x: x[1].get('points',0), reverse=True)[:10]
         print(f"  {CY}{'#':<4}{'Username':<22}{'Pts':>7}{'W':>5}{'L':>5}{'🔥':>5}{'Ach':>5}{R}")
         hline('─', GY, 55)
         medals = ['🥇','🥈','🥉']
@@ -785,7 +3480,8 @@ def show_leaderboard(lang):
                   f"{st.get('streak',0):>5}{len(st.get('unlocked',[])):>5}{R}")
 
     hline('─', GY, w)
-    input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
+    if wait:
+        input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
 
 def show_stats(name, stats, lang):
     clear()
@@ -815,8 +3511,8 @@ def show_stats(name, stats, lang):
         f"  {GY}{'Wins in English':<20}{R} {CY}{stats.get('wins_en',0)}{R}",
         f"  {GY}{'Total games':<20}{R} {WH}{total}{R}",
         f"",
-        f"  {GY}{'Achievements':<20}{R} {YL}{len(stats['unlocked'])}/{len(ACHIEVEMENTS)}{R}",
-        f"  {progress_bar(len(stats['unlocked']), len(ACHIEVEMENTS), 20)}",
+        f"  {GY}{'Achievements':<20}{R} {YL}{stats.n_unlocked}/{len(ACHIEVEMENTS)}{R}",
+        f"  {progress_bar(stats.n_unlocked, len(ACHIEVEMENTS), 20)}",
     ]
 
     if w >= 80:
@@ -834,167 +3530,240 @@ def show_stats(name, stats, lang):
 #  GAME LOOP
 #
 
-def play_game(user, stats, lang, difficulty, custom_word=None):
-    global _sfx_on
-
-    cfg = DIFFICULTY[difficulty]
-    max_tries = cfg['tries']
-    time_limit = cfg['time']
-    multiplier = cfg['mult']
-    hint_cost = cfg['hcost']
-
-    if custom_word:
-        wdata = custom_word
-    else:
-        wdata = random.choice(AR_WORDS if lang=='ar' else EN_WORDS)
+def render_game(game, user, stats, lang, hint_text, remaining, keys=False, message=None):
+    """Draw the game screen in one write.
 
-    word = wdata['w'].lower()
-    hint_text = wdata['h']
-    category = wdata.get('cat', '')
-
-    letters = set(c for c in word if c != ' ')
-    guessed = set()
-    correct = set()
-    wrong = set()
-    mistakes = 0
-    hint_used = False
-    combo = 0
-    start = time.time()
-    active = True
-    danger_played = False
-
-    while letters and mistakes < max_tries and active:
-        elapsed = time.time() - start
-        remaining = max(0, int(time_limit - elapsed))
-        if remaining <= 0:
-            break
-        if remaining <= 10 and not danger_played:
-            Sounds.danger()
-            danger_played = True
-
-        # render screen
-        clear()
+    keys=True labels the single-key commands and homes the cursor with ANSI
+    codes instead of running `clear`.  Returns the screen row of the time
+    bar for redraw_timer(), or None when the frame is taller than the
+    terminal and that row has scrolled away.
+    """
+    max_tries, time_limit, hint_cost = game.max_tries, game.time_limit, game.hint_cost
+    k_hint, k_ach, k_sound, k_quit = ('1', '2', '3', 'Esc') if keys else ('H', 'A', 'S', 'Q')
+    balance = stats['points'] + game.points     # the game is folded into stats when it ends
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
         w = term_width()
         # header
         print()
-        stats_line = f"  {CY}{user}{R}  ⚡{YL}{stats['points']:>5}{R}pts  ✔{GR}{stats['wins']:>2}{R}  ✘{RD}{stats['losses']:>2}{R}  🔥{MG}{stats['streak']}{R}"
+        stats_line = f"  {CY}{user}{R}  ⚡{YL}{balance:>5}{R}pts  ✔{GR}{stats['wins']:>2}{R}  ✘{RD}{stats['losses']:>2}{R}  🔥{MG}{stats['streak']}{R}"
         hline('─', GY, w)
         print(stats_line)
         hline('─', GY, w)
         print()
 
 
-        for line in draw_gallows(mistakes, max_tries):
+        for line in draw_gallows(game.mistakes, max_tries):
             print(line)
         print()
 
 
         if w >= 60:
-            for line in display_word_boxes(word, guessed):
+            for line in display_word_boxes(game.word, game.revealed):
                 print(line)
         else:
-            print(f"    {display_word(word, guessed)}")
+            print(f"    {display_word(game.word, game.revealed)}")
         print()
 
 
-        found = sum(1 for c in set(c for c in word if c!=' ') if c in guessed)
-        total_u = len(set(c for c in word if c!=' '))
+        found, total_u, mistakes = game.found, game.total, game.mistakes
         print(f"  {progress_bar(found, total_u, 16)}  {gr}{found}/{total_u} {'letters' if lang=='en' else 'حرف'}{R}")
         print(f"  {'Mistakes' if lang=='en' else 'الأخطاء'}: {progress_bar(mistakes, max_tries, 14, invert=True)}  ({RD}{mistakes}{R}/{GY}{max_tries}{R})")
+        row = buf.getvalue().count('\n') + 1
         print(f"  {time_bar(remaining, time_limit)}")
-        if combo > 1:
-            print(f"\n  {HIMG} ×{combo} COMBO! {R}")
-        if wrong:
-            wrong_str = '  '.join(f"{RD}{c.upper()}{R}" for c in sorted(wrong))
+        if game.combo > 1:
+            print(f"\n  {HIMG} ×{game.combo} COMBO! {R}")
+        if game.wrong:
+            wrong_str = '  '.join(f"{RD}{c.upper()}{R}" for c in sorted(game.wrong))
             print(f"\n  {'Wrong' if lang=='en' else 'خاطئة'}: {wrong_str}")
-        if hint_used:
+        if game.hint_used:
             print(f"\n  {MG}💡 {hint_text}{R}")
         else:
-            cost_color = YL if stats['points'] >= hint_cost else RD
-            print(f"\n  {GY}💡 [H] {'Hint' if lang=='en' else 'تلميح'} {cost_color}{hint_cost}pts{R}")
+            cost_color = YL if balance >= hint_cost else RD
+            print(f"\n  {GY}💡 [{k_hint}] {'Hint' if lang=='en' else 'تلميح'} {cost_color}{hint_cost}pts{R}")
 
         # keyboard
-        draw_keyboard(guessed, correct, wrong, lang)
+        draw_keyboard(game, lang)
 
         # command bar
         print(f"\n  {GY}{'─'*min(w-4, 68)}{R}")
         if w >= 60:
             opts = [
                 f"{WH}[letter]{R} {'Guess' if lang=='en' else 'تخمين'}",
-                f"{WH}[H]{R} {'Hint' if lang=='en' else 'تلميح'}",
-                f"{WH}[A]{R} {'Ach' if lang=='en' else 'إنجازات'}",
-                f"{WH}[S]{R} {'Sound' if lang=='en' else 'صوت'}",
-                f"{WH}[Q]{R} {'Quit' if lang=='en' else 'خروج'}",
+                f"{WH}[{k_hint}]{R} {'Hint' if lang=='en' else 'تلميح'}",
+                f"{WH}[{k_ach}]{R} {'Ach' if lang=='en' else 'إنجازات'}",
+                f"{WH}[{k_sound}]{R} {'Sound' if lang=='en' else 'صوت'}",
+                f"{WH}[{k_quit}]{R} {'Quit' if lang=='en' else 'خروج'}",
             ]
             print('  ' + '   '.join(opts))
         else:
-            print(f"  {WH}[letter]{R} guess  {WH}[H]{R} hint  {WH}[Q]{R} quit")
+            print(f"  {WH}[letter]{R} guess  {WH}[{k_hint}]{R} hint  {WH}[{k_quit}]{R} quit")
         print(f"  {GY}{'─'*min(w-4, 68)}{R}")
+        if message:
+            print(f"\n  {message}")
+    frame = buf.getvalue()
+    if keys:
+        sys.stdout.write('\x1b[H\x1b[2J' + frame)
+    else:
+        clear()
+        sys.stdout.write(frame)
+    sys.stdout.flush()
+    return row if frame.count('\n') < term_height() else None
 
-        # input
-        cmd = input(f"\n  {YL}→  {R}").strip().lower()
-
-        if cmd in ('q','quit','exit'):
-            active = False
-            break
-        if cmd == 'a':
-            Sounds.click()
-            show_achievements(stats, lang)
-            continue
-        if cmd == 's':
-            _sfx_on = not _sfx_on
-            Sounds.click()
-            continue
-        if cmd in ('h','hint'):
-            if hint_used:
-                print(f"\n  {RD}{'Hint already used!' if lang=='en' else 'التلميح مستخدم!'}{R}")
-            elif stats['points'] < hint_cost:
-                print(f"\n  {RD}{'Not enough points!' if lang=='en' else 'نقاط غير كافية!'}{R}")
-                Sounds.wrong()
-            else:
-                stats['points'] -= hint_cost
-                hint_used = True
-                Sounds.hint()
-                print(f"\n  {MG}💡 {hint_text}{R}")
-            time.sleep(1.2)
-            continue
-
-        # guess a letter
-        ch = None
-        if len(cmd) == 1 and (cmd.isalpha() or ord(cmd) > 127):
-            ch = cmd
-        else:
-            # ask again
-            ch = input(f"  {CY}{'Letter:' if lang=='en' else 'الحرف:'} {R}").strip().lower()
-            if ch:
-                ch = ch[0]
-
-        if not ch or ch in guessed:
-            continue
+def redraw_timer(row, remaining, time_limit):
+    # rewrite just the time-bar line, leaving the cursor where it was
+    sys.stdout.write(f"\x1b7\x1b[{row};1H\x1b[2K  {time_bar(remaining, time_limit)}\x1b8")
+    sys.stdout.flush()
 
-        guessed.add(ch)
-        if ch in letters:
-            letters.remove(ch)
-            correct.add(ch)
-            combo += 1
-            points = int(10 * multiplier) + (combo - 1) * 3
-            stats['points'] += points
+def _game_action(game, action, ch, stats, lang, hint_text):
+    """Apply one player action; returns the feedback line to show, or None."""
+    global _sfx_on
+    if action == 'quit':
+        game.quit()
+    elif action == 'ach':
+        Sounds.click()
+        show_achievements(stats, lang)
+    elif action == 'sound':
+        _sfx_on = not _sfx_on
+        Sounds.click()
+    elif action == 'hint':
+        if game.hint_used:
+            return f"{RD}{'Hint already used!' if lang=='en' else 'التلميح مستخدم!'}{R}"
+        if game.buy_hint(stats['points'] + game.points) is None:
+            Sounds.wrong()
+            return f"{RD}{'Not enough points!' if lang=='en' else 'نقاط غير كافية!'}{R}"
+        Sounds.hint()
+        return f"{MG}💡 {hint_text}{R}"
+    else:
+        points = game.guess(ch)
+        if points is None:      # already tried in some form
+            return None
+        if points:
             Sounds.correct()
             msg = f"{'Correct! +' if lang=='en' else 'صحيح! +'}{points}pts"
-            if combo > 1:
-                msg += f"  ×{combo}"
-            print(f"\n  {GR}{msg}{R}")
-        else:
-            wrong.add(ch)
-            mistakes += 1
-            combo = 0
-            Sounds.wrong()
-            print(f"\n  {RD}{'Wrong!' if lang=='en' else 'خطأ!'}  ({max_tries-mistakes} {'left' if lang=='en' else 'متبقية'}){R}")
-        time.sleep(0.7)
+            if game.combo > 1:
+                msg += f"  ×{game.combo}"
+            return f"{GR}{msg}{R}"
+        Sounds.wrong()
+        return f"{RD}{'Wrong!' if lang=='en' else 'خطأ!'}  ({game.max_tries-game.mistakes} {'left' if lang=='en' else 'متبقية'}){R}"
+    return None
+
+_LINE_COMMANDS = {'q': 'quit', 'quit': 'quit', 'exit': 'quit', 'a': 'ach', 's': 'sound',
+                  'h': 'hint', 'hint': 'hint'}
+_KEY_COMMANDS = {'1': 'hint', '2': 'ach', '3': 'sound', '\x1b': 'quit'}
+
+def key_actions(keys):
+    """(action, letter) for each keystroke that means something in a game."""
+    for key in keys:
+        action = _KEY_COMMANDS.get(key)
+        if action:
+            yield action, None
+        elif key.isalpha() or ord(key) > 127:
+            yield 'guess', key.lower()
+
+def _play_lines(game, clock, user, stats, lang, hint_text):
+    # one command per Enter; the timer only moves when the screen is redrawn
+    while True:
+        remaining = game.tick(clock())
+        if game.outcome:
+            return
+        if game.alarm:
+            Sounds.danger()
 
-    # game ended
-    elapsed = time.time() - start
-    won = (not letters) and active
+        render_game(game, user, stats, lang, hint_text, remaining)
+
+        # input
+        cmd = input(f"\n  {YL}→  {R}").strip().lower()
+        action, ch = _LINE_COMMANDS.get(cmd), None
+        if action is None:
+            action = 'guess'
+            if len(cmd) == 1 and (cmd.isalpha() or ord(cmd) > 127):
+                ch = cmd
+            else:
+                # ask again
+                ch = input(f"  {CY}{'Letter:' if lang=='en' else 'الحرف:'} {R}").strip().lower()[:1]
+            if not ch:
+                continue
+        msg = _game_action(game, action, ch, stats, lang, hint_text)
+        if action == 'quit':
+            return
+        if msg:
+            print(f"\n  {msg}")
+            time.sleep(1.2 if action == 'hint' else 0.7)
+
+def _play_keys(game, clock, user, stats, lang, hint_text, reader=None):
+    # single keystrokes without Enter: wake on keys, on each whole second of
+    # the countdown (redrawing only the timer) and at the deadline
+    msg, dirty, row, shown, pressed = None, True, None, None, None
+    with reader or KeyReader() as keys:
+        while True:
+            remaining = game.tick(clock())
+            if game.outcome:
+                return
+            if game.alarm:
+                Sounds.danger()
+            if dirty or (row is None and remaining != shown):
+                row = render_game(game, user, stats, lang, hint_text, remaining, keys=True, message=msg)
+                dirty, shown = False, remaining
+                if pressed is not None:
+                    input_stats.latency(time.perf_counter() - pressed)
+                    pressed = None
+            elif remaining != shown:
+                redraw_timer(row, remaining, game.time_limit)
+                shown = remaining
+            left = game.time_limit - game.elapsed
+            batch = keys.read(min(INPUT_TICK, left - int(left) + 0.002))
+            if not batch:
+                continue
+            pressed = time.perf_counter()
+            msg = None
+            for action, ch in key_actions(batch):   # typed-ahead keys share one redraw
+                if action == 'ach':
+                    with keys.cooked():
+                        _game_action(game, action, ch, stats, lang, hint_text)
+                else:
+                    msg = _game_action(game, action, ch, stats, lang, hint_text) or msg
+                dirty = True
+                if game.outcome:
+                    return
+
+def new_game(user, stats, lang, difficulty, clock, custom_word=None):
+    """Pick the word and set up its GameState; returns (game, word entry, bank index)."""
+    bank = word_bank(lang)
+    if custom_word:
+        wdata, widx = custom_word, None
+    else:
+        widx = next_word(user, stats, lang, difficulty)
+        wdata = bank[widx]
+    word = wdata['w'].lower()
+    game = GameState(word, lang, difficulty)
+    if REPLAY_DIR:
+        game = ReplayRecorder(game, clock, Replay(user, lang, difficulty, word, wdata['h'],
+                                                  MATCH_MODE, stats['points']))
+    return game, wdata, widx
+
+def record_result(game, user, stats, lang, difficulty, widx):
+    """Score a finished game and commit it; returns (result, new achievements)."""
+    res = game.result()
+    if REPLAY_DIR:
+        game.save(REPLAY_DIR, res)
+    rec = game_record(user, lang, difficulty, game.word, res['outcome'], res['mistakes'], res['elapsed'],
+                      res['points'], game.hint_used, widx, word_bank(lang).version)
+    return res, commit_record(user, stats, rec)
+
+def finish_game(game, user, stats, lang, difficulty, widx, live=True, recorded=None):
+    """Score and record a finished game, then draw the result screen.
+
+    live=False draws without the blinking, typing and Enter prompt, for
+    screens that are not the local terminal.  `recorded` is the return of
+    record_result() when the game was committed already (the server does
+    that off its event loop).
+    """
+    res, new_achs = recorded or record_result(game, user, stats, lang, difficulty, widx)
+    won, mistakes, elapsed = res['won'], res['mistakes'], res['elapsed']
+    word, max_tries = game.word, game.max_tries
+    blink = blink_line if live else (lambda text, times=2: print(text))
+    write = typewrite if live else (lambda text, delay=0: print(text))
 
     clear()
     w = term_width()
@@ -1012,35 +3781,18 @@ def play_game(user, stats, lang, difficulty, custom_word=None):
 
 
     if w >= 60:
-        for line in display_word_boxes(word, guessed, reveal=not won):
+        for line in display_word_boxes(word, game.revealed, reveal=not won):
             print(line)
     else:
-        print(f"    {display_word(word, guessed, reveal=not won)}")
+        print(f"    {display_word(word, game.revealed, reveal=not won)}")
     print()
 
-    if won:
-        time_bonus = max(0, int((time_limit - elapsed) / 2))
-        combo_bonus = int(combo * 4)
-        earned = int(50 * multiplier) + time_bonus + combo_bonus
-
-        stats['points'] += earned
-        stats['wins'] += 1
-        stats['streak'] += 1
-        stats['best_streak'] = max(stats['streak'], stats.get('best_streak', 0))
-        stats['perfect'] = (mistakes == 0)
-        stats['loss_streak'] = 0
-        if elapsed < stats.get('best_t', 999):
-            stats['best_t'] = elapsed
-        if lang == 'ar':
-            stats['wins_ar'] += 1
-        else:
-            stats['wins_en'] += 1
-        if not hint_used:
-            stats['wnh'] += 1
+    time_bonus, combo_bonus, earned = res['time_bonus'], res['combo_bonus'], res['earned']
 
+    if won:
         Sounds.win()
-        blink_line(f"  {HIGR}  ✔  {'YOU WIN!' if lang=='en' else 'فزت!'}  {R}", times=2)
-        print(f"\n  {GY}{'Base:':>14}{R} {YL}+{int(50*multiplier)}{R}")
+        blink(f"  {HIGR}  ✔  {'YOU WIN!' if lang=='en' else 'فزت!'}  {R}", times=2)
+        print(f"\n  {GY}{'Base:':>14}{R} {YL}+{res['base']}{R}")
         if time_bonus:
             print(f"  {GY}{'Time bonus:':>14}{R} {CY}+{time_bonus}{R}")
         if combo_bonus:
@@ -1049,39 +3801,238 @@ def play_game(user, stats, lang, difficulty, custom_word=None):
         print(f"  {GY}{'Total earned:':>14}{R} {YL}{B}+{earned}{R}")
         print(f"  {GY}{'Time:':>14}{R} {CY}{elapsed:.1f}s{R}")
     else:
-        stats['losses'] += 1
-        stats['streak'] = 0
-        stats['perfect'] = False
-        stats['loss_streak'] = stats.get('loss_streak', 0) + 1
         Sounds.lose()
-        if not active:
+        if res['outcome'] == 'quit':
             print(f"  {GY}{'Game abandoned.' if lang=='en' else 'تم التخلي عن اللعبة.'}{R}")
         else:
-            blink_line(f"  {HIRD}  ✘  {'YOU LOST!' if lang=='en' else 'خسرت!'}  {R}", times=2)
+            blink(f"  {HIRD}  ✘  {'YOU LOST!' if lang=='en' else 'خسرت!'}  {R}", times=2)
             print(f"\n  {'The word was:' if lang=='en' else 'الكلمة كانت:'} {YL}{B}{word.upper()}{R}")
 
-    # comeback achievement
-    if won and stats.get('loss_streak', 0) >= 3:
-        stats['comeback'] = True
-
-    stats['total_games'] += 1
-    stats['total_time'] += elapsed
-    save_player(user, stats)
-
-    new_achs = check_achievements(stats)
     if new_achs:
-        save_player(user, stats)
         print(f"\n  {YL}{'═'*min(w-4,54)}{R}")
         center_print(f"{CY}{'🏆 Achievement Unlocked!' if lang=='en' else '🏆 إنجاز جديد!'}{R}", w)
         for a in new_achs:
             Sounds.achievement()
             name = a['en'] if lang=='en' else a['ar']
             desc = a['desc_en'] if lang=='en' else a['desc_ar']
-            typewrite(f"  {a['icon']}  {GR}{B}{name}{R}  —  {GY}{desc}{R}", delay=0.012)
-            time.sleep(0.3)
+            write(f"  {a['icon']}  {GR}{B}{name}{R}  —  {GY}{desc}{R}", delay=0.012)
+            if live:
+                time.sleep(0.3)
         print(f"  {YL}{'═'*min(w-4,54)}{R}")
 
-    input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
+    if live:
+        input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
+    return res
+
+def play_game(user, stats, lang, difficulty, custom_word=None):
+    clock = game_clock()
+    game, wdata, widx = new_game(user, stats, lang, difficulty, clock, custom_word)
+    if key_input_available():
+        _play_keys(game, clock, user, stats, lang, wdata['h'])
+    else:
+        _play_lines(game, clock, user, stats, lang, wdata['h'])
+    game.tick(clock())
+    return finish_game(game, user, stats, lang, difficulty, widx)
+
+#  REPLAYS
+#
+#  With HANGMAN_REPLAYS set, every game is recorded to a .hrp file in that
+#  folder: the word and settings, then each GameState call (tick, guess,
+#  hint, quit) with its millisecond timestamp, then the result.  Numbers are
+#  LEB128 varints (zigzag for signed ones); an event is varint(delta_ms << 3
+#  | kind) plus an argument for guesses (code point) and hints (balance).
+#  Replaying feeds the same calls to a fresh GameState, so the time bonus,
+#  the danger warning and timeouts come out exactly as they did live.
+
+REPLAY_DIR = os.environ.get('HANGMAN_REPLAYS')   # None → games are not recorded
+REPLAY_MAGIC = b'HRP1'
+EV_TICK, EV_GUESS, EV_HINT, EV_QUIT, EV_END = range(5)
+_OUTCOMES = ('win', 'lose', 'timeout', 'quit')
+_replay_seq = itertools.count()
+
+def _put_varint(buf, n):
+    while n >= 0x80:
+        buf.append(n & 0x7F | 0x80)
+        n >>= 7
+    buf.append(n)
+
+def _get_varint(data, pos):
+    n = shift = 0
+    while True:
+        b = data[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+def _zigzag(n):
+    return n << 1 if n >= 0 else (-n << 1) - 1
+
+def _unzigzag(n):
+    return n >> 1 if not n & 1 else -((n + 1) >> 1)
+
+class Replay:
+    """One recorded game: settings, (ms, kind, arg) events and the result."""
+    __slots__ = ('user', 'lang', 'difficulty', 'word', 'hint', 'mode', 'balance', 'started',
+                 'events', 'outcome', 'points')
+
+    def __init__(self, user, lang, difficulty, word, hint='', mode='lenient', balance=0, started=None):
+        self.user, self.lang, self.difficulty, self.word = user, lang, difficulty, word
+        self.hint, self.mode, self.balance = hint, mode, balance
+        self.started = int(time.time()) if started is None else started
+        self.events = []
+        self.outcome = self.points = None
+
+    def encode(self):
+        buf = bytearray(REPLAY_MAGIC)
+        for text in (self.user, self.lang, self.difficulty, self.word, self.hint, self.mode):
+            raw = text.encode('utf-8')
+            _put_varint(buf, len(raw))
+            buf += raw
+        _put_varint(buf, _zigzag(self.balance))
+        _put_varint(buf, self.started)
+        last = 0
+        for ms, kind, arg in self.events:
+            _put_varint(buf, (ms - last) << 3 | kind)
+            last = ms
+            if kind == EV_GUESS:
+                _put_varint(buf, arg)
+            elif kind == EV_HINT:
+                _put_varint(buf, _zigzag(arg))
+        if self.outcome is not None:
+            _put_varint(buf, EV_END)
+            _put_varint(buf, _OUTCOMES.index(self.outcome))
+            _put_varint(buf, _zigzag(self.points))
+        return bytes(buf)
+
+    @classmethod
+    def decode(cls, data):
+        if data[:len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError('not a hangman replay')
+        pos, fields = len(REPLAY_MAGIC), []
+        for _ in range(6):
+            n, pos = _get_varint(data, pos)
+            fields.append(bytes(data[pos:pos + n]).decode('utf-8'))
+            pos += n
+        balance, pos = _get_varint(data, pos)
+        started, pos = _get_varint(data, pos)
+        rp = cls(*fields, balance=_unzigzag(balance), started=started)
+        ms = 0
+        while pos < len(data):
+            head, pos = _get_varint(data, pos)
+            kind = head & 7
+            if kind == EV_END:
+                outcome, pos = _get_varint(data, pos)
+                points, pos = _get_varint(data, pos)
+                rp.outcome, rp.points = _OUTCOMES[outcome], _unzigzag(points)
+                break
+            ms += head >> 3
+            arg = 0
+            if kind == EV_GUESS:
+                arg, pos = _get_varint(data, pos)
+            elif kind == EV_HINT:
+                arg, pos = _get_varint(data, pos)
+                arg = _unzigzag(arg)
+            rp.events.append((ms, kind, arg))
+        return rp
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.decode(f.read())
+
+class ReplayRecorder:
+    """A GameState stand-in that logs every call into a Replay."""
+
+    def __init__(self, game, clock, replay):
+        self._game = game
+        self._clock = clock
+        self.replay = replay
+
+    def __getattr__(self, name):
+        return getattr(self._game, name)
+
+    def _log(self, now, kind, arg=0):
+        self.replay.events.append((round(now * 1000), kind, arg))
+
+    def tick(self, now):
+        self._log(now, EV_TICK)
+        return self._game.tick(now)
+
+    def guess(self, ch):
+        self._log(self._clock(), EV_GUESS, ord(ch))
+        return self._game.guess(ch)
+
+    def buy_hint(self, balance):
+        self._log(self._clock(), EV_HINT, balance)
+        return self._game.buy_hint(balance)
+
+    def quit(self):
+        self._log(self._clock(), EV_QUIT)
+        return self._game.quit()
+
+    def save(self, folder, res):
+        rp = self.replay
+        rp.outcome, rp.points = res['outcome'], res['points']
+        user = re.sub(r'[^\w-]', '_', rp.user)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{user}-{os.getpid()}-{next(_replay_seq)}.hrp"
+        try:
+            os.makedirs(folder, exist_ok=True)
+            with open(os.path.join(folder, name), 'wb') as f:
+                f.write(rp.encode())
+        except OSError:
+            pass        # a lost recording must not cost the player the game
+
+def run_replay(rp, speed=None):
+    """Re-execute a Replay on a fresh GameState; returns the finished game.
+
+    speed=None runs flat out with no output; otherwise events are paced at
+    `speed` × real time and each tick redraws the game screen.
+    """
+    game = GameState(rp.word, rp.lang, rp.difficulty, mode=rp.mode)
+    t0 = time.monotonic()
+    stats = PlayerStats()
+    for ms, kind, arg in rp.events:
+        now = ms / 1000
+        if speed:
+            delay = t0 + now / speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        if kind == EV_TICK:
+            remaining = game.tick(now)
+            if speed and not game.outcome:
+                if game.alarm:
+                    Sounds.danger()
+                stats['points'] = rp.balance
+                render_game(game, rp.user, stats, rp.lang, rp.hint, remaining)
+        elif kind == EV_GUESS:
+            game.guess(chr(arg))
+        elif kind == EV_HINT:
+            game.buy_hint(arg)
+        elif kind == EV_QUIT:
+            game.quit()
+    return game
+
+def replay_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith('.hrp'):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+def check_replays(paths):
+    """Replay files headlessly; returns (replays, mismatches, seconds)."""
+    n, bad, t0 = 0, [], time.perf_counter()
+    for path in replay_files(paths):
+        rp = Replay.load(path)
+        res = run_replay(rp).result()
+        n += 1
+        if rp.outcome is not None and (res['outcome'], res['points']) != (rp.outcome, rp.points):
+            bad.append((path, (rp.outcome, rp.points), (res['outcome'], res['points'])))
+    return n, bad, time.perf_counter() - t0
 
 #  DAILY CHALLENGE
 #
@@ -1098,15 +4049,16 @@ def play_daily(user, stats, lang):
 
     if chal['lang'] != lang:
         lang_name = 'Arabic / العربية' if chal['lang']=='ar' else 'English / الإنجليزية'
-        print(f"\n  {YL}{'Today\'s challenge is in' if lang=='en' else 'تحدي اليوم باللغة'}: {lang_name}{R}")
+        intro = "Today's challenge is in" if lang=='en' else 'تحدي اليوم باللغة'
+        print(f"\n  {YL}{intro}: {lang_name}{R}")
         input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
         return
 
     input(f"\n  {GY}{'Press Enter to start...' if lang=='en' else 'اضغط Enter للبدء...'}{R}")
     play_game(user, stats, chal['lang'], 'medium',
               custom_word={'w': chal['w'], 'h': chal['h'], 'cat': '⭐ Daily'})
-    stats['points'] += 200
-    save_player(user, stats)
+    rec = bonus_record(user, 200, 'daily')
+    commit_record(user, stats, rec)
     print(f"\n  {MG}⭐ +200 bonus points!{R}")
     input(f"\n  {GY}{'Press Enter...' if lang=='en' else 'اضغط Enter...'}{R}")
 
@@ -1235,11 +4187,861 @@ def main_menu(user, stats, lang, difficulty):
             print(f"  {CY}║{R}{raw}")
         print(f"  {CY}╚{'═'*(min(w-4,40))}╝{R}")
 
+#
+#  GAME SERVER  (python hangman.py serve)
+#
+#  One asyncio process hosts every session of a classroom over telnet (or
+#  plain TCP).  Sessions share the process's word banks, solver indexes and
+#  player store; each keeps only its socket streams, a UTF-8 decoder, its
+#  terminal size and the GameState of the game in progress.  Screens are
+#  drawn by the same functions as the terminal game, with stdout redirected
+#  into a buffer and term_width()/clear() pointed at the client's terminal
+#  for the duration of one synchronous draw.  The server asks telnet clients
+#  for character mode (WILL ECHO, WILL SGA) and their window size (NAWS), so
+#  keys arrive one at a time like the local key loop.
+
+SERVER_HOST = '0.0.0.0'
+SERVER_PORT = 4023
+SERVER_IDLE = 600       # seconds without a key before a session is dropped
+IAC, SB, SE, WILL, WONT, DO, DONT = 255, 250, 240, 251, 252, 253, 254
+TN_ECHO, TN_SGA, TN_NAWS = 1, 3, 31
+
+class Session:
+    """One client connection: telnet-filtered keys in, drawn screens out."""
+    __slots__ = ('reader', 'writer', 'size', '_decoder', '_telnet', '_ahead')
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.size = (80, 24)
+        self._decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        self._telnet = b''      # an IAC sequence split across reads
+        self._ahead = []        # keys typed after the Enter that ended a line
+
+    def hello(self):
+        self.writer.write(bytes([IAC, WILL, TN_ECHO, IAC, WILL, TN_SGA, IAC, DO, TN_NAWS]))
+
+    def _filter(self, data):
+        # drop telnet commands, keeping the window size from NAWS
+        data = self._telnet + data
+        out, i, n = bytearray(), 0, len(data)
+        while i < n:
+            b = data[i]
+            if b != IAC:
+                out.append(b)
+                i += 1
+                continue
+            if i + 1 >= n:
+                break
+            cmd = data[i + 1]
+            if cmd == IAC:
+                out.append(IAC)
+                i += 2
+            elif cmd in (WILL, WONT, DO, DONT):
+                if i + 2 >= n:
+                    break
+                i += 3
+            elif cmd == SB:
+                end = data.find(bytes([IAC, SE]), i)
+                if end < 0:
+                    break
+                sub = data[i + 2:end]
+                if len(sub) >= 5 and sub[0] == TN_NAWS:
+                    cols, rows = struct.unpack('>HH', sub[1:5])
+                    if cols and rows:
+                        self.size = (cols, rows)
+                i = end + 2
+            else:
+                i += 2
+        self._telnet = data[i:]
+        return bytes(out)
+
+    async def keys(self, timeout=SERVER_IDLE):
+        """Keys typed so far (Enter as '\\r'), waiting up to `timeout`; [] if none."""
+        if self._ahead:
+            keys, self._ahead = self._ahead, []
+            return keys
+        try:
+            data = await asyncio.wait_for(self.reader.read(1024), timeout)
+        except asyncio.TimeoutError:
+            if timeout == SERVER_IDLE:
+                raise ConnectionResetError('idle')
+            return []
+        if not data:
+            raise ConnectionResetError('closed')
+        text = self._decoder.decode(self._filter(data))
+        text = _ESCAPES.sub('', text).replace('\r\n', '\r').replace('\r\0', '\r').replace('\n', '\r')
+        return list(text)
+
+    async def anykey(self):
+        while not await self.keys():
+            pass
+
+    def show(self, draw, *args, **kwargs):
+        """Run a drawing function with its output sent to this client."""
+        buf = io.StringIO()
+        token = _remote_term.set(self.size)
+        try:
+            with contextlib.redirect_stdout(buf):
+                result = draw(*args, **kwargs)
+        finally:
+            _remote_term.reset(token)
+        self.writer.write(buf.getvalue().replace('\n', '\r\n').encode('utf-8'))
+        return result
+
+    async def ask(self, prompt, limit=32):
+        """Read one line, echoing it back (the client has echo off)."""
+        self.show(print, prompt, end='')
+        await self.writer.drain()
+        line = ''
+        while True:
+            keys = await self.keys()
+            for i, k in enumerate(keys):
+                if k == '\r':
+                    self.writer.write(b'\r\n')
+                    self._ahead = keys[i + 1:]
+                    return line.strip()
+                if k in ('\x7f', '\b'):
+                    if line:
+                        line = line[:-1]
+                        self.writer.write(b'\b \b')
+                elif k.isprintable() and len(line) < limit:
+                    line += k
+                    self.writer.write(k.encode('utf-8'))
+            await self.writer.drain()
+
+def _server_menu(user, stats, lang, difficulty):
+    clear()
+    w = term_width()
+    print()
+    center_print(f"{YL}HANGMAN · المشنوق{R}", w)
+    hline('─', GY, w)
+    print(f"  {CY}{user}{R}  ⚡{YL}{stats['points']:>5}{R}pts  ✔{GR}{stats['wins']:>2}{R}  ✘{RD}{stats['losses']:>2}{R}  🔥{MG}{stats['streak']}{R}")
+    hline('─', GY, w)
+    level = DIFFICULTY[difficulty]['en' if lang == 'en' else 'ar']
+    items = ([('1', '▶  Start Game'), ('2', f'⚙  Difficulty: {level}'), ('3', '🏆  Achievements'),
+              ('4', '🏅  Leaderboard'), ('9', '🌍  العربية'), ('0', '⏻   Exit')] if lang == 'en' else
+             [('1', '▶  ابدأ اللعب'), ('2', f'⚙  الصعوبة: {level}'), ('3', '🏆  الإنجازات'),
+              ('4', '🏅  قادة النقاط'), ('9', '🌍  English'), ('0', '⏻   خروج')])
+    print()
+    for k, label in items:
+        print(f"  {GY}[{k}]{R}  {label}")
+
+def _press_any_key(lang):
+    print(f"\n  {GY}{'Press any key...' if lang=='en' else 'اضغط أي مفتاح...'}{R}")
+
+async def _serve_game(s, user, stats, lang, difficulty):
+    clock = game_clock()
+    game, wdata, widx = new_game(user, stats, lang, difficulty, clock)
+    loop = asyncio.get_running_loop()
+    try:
+        await _serve_play(s, game, clock, user, stats, lang, wdata['h'])
+    except BaseException as e:
+        # the client went away or the server is stopping: the game counts as quit
+        game.tick(clock())
+        game.quit()
+        if isinstance(e, asyncio.CancelledError):
+            record_result(game, user, stats, lang, difficulty, widx)
+        else:
+            await loop.run_in_executor(None, record_result, game, user, stats, lang, difficulty, widx)
+        raise
+    game.tick(clock())
+    # store I/O (locks, fsync, the coordinator) runs off the event loop
+    recorded = await loop.run_in_executor(None, record_result, game, user, stats, lang, difficulty, widx)
+    s.show(finish_game, game, user, stats, lang, difficulty, widx, live=False, recorded=recorded)
+    s.show(_press_any_key, lang)
+    await s.writer.drain()
+    await s.anykey()
+
+async def _serve_play(s, game, clock, user, stats, lang, hint_text):
+    # the key loop of _play_keys, awaiting the socket instead of a selector
+    msg, dirty, row, shown = None, True, None, None
+    while True:
+        remaining = game.tick(clock())
+        if game.outcome:
+            break
+        if game.alarm:
+            s.writer.write(b'\a')
+        if dirty or (row is None and remaining != shown):
+            row = s.show(render_game, game, user, stats, lang, hint_text, remaining, keys=True, message=msg)
+            dirty, shown = False, remaining
+        elif remaining != shown:
+            s.show(redraw_timer, row, remaining, game.time_limit)
+            shown = remaining
+        await s.writer.drain()
+        left = game.time_limit - game.elapsed
+        batch = await s.keys(min(INPUT_TICK, left - int(left) + 0.002))
+        if not batch:
+            continue
+        msg = None
+        for action, ch in key_actions(batch):
+            if action == 'ach':
+                s.show(show_achievements, stats, lang, wait=False)
+                s.show(_press_any_key, lang)
+                await s.writer.drain()
+                await s.anykey()
+            elif action != 'sound':         # the server plays no sound
+                msg = _game_action(game, action, ch, stats, lang, hint_text) or msg
+            dirty = True
+            if game.outcome:
+                break
+
+async def _serve_session(reader, writer):
+    s = Session(reader, writer)
+    s.hello()
+    try:
+        s.show(clear)
+        name = (await s.ask(f"  {YL}Username / اسم المستخدم: {R}"))[:24] or 'Player'
+        while True:
+            lang = (await s.ask(f"  {YL}Language / اللغة  [en / ar]: {R}")).lower()
+            if lang in ('en', 'ar'):
+                break
+        loop = asyncio.get_running_loop()
+        stats = await loop.run_in_executor(None, get_player, name)
+        diff = 'medium'
+        while True:
+            s.show(_server_menu, name, stats, lang, diff)
+            await s.writer.drain()
+            for key in await s.keys():
+                if key == '1':
+                    await _serve_game(s, name, stats, lang, diff)
+                elif key == '2':
+                    diff = TIERS[(TIERS.index(diff) + 1) % len(TIERS)]
+                elif key in ('3', '4'):
+                    if key == '3':
+                        s.show(show_achievements, stats, lang, wait=False)
+                    else:
+                        ranked = await loop.run_in_executor(None, _store().top, LEADERBOARD_K)
+                        s.show(show_leaderboard, lang, wait=False, ranked=ranked)
+                    s.show(_press_any_key, lang)
+                    await s.writer.drain()
+                    await s.anykey()
+                elif key == '9':
+                    lang = 'ar' if lang == 'en' else 'en'
+                elif key in ('0', '\x1b', '\x04'):
+                    s.show(print, f"\n  {YL}{'Goodbye! 👋' if lang=='en' else 'مع السلامة! 👋'}{R}")
+                    await s.writer.drain()
+                    return
+                else:
+                    continue
+                break       # redraw the menu, dropping keys typed ahead of it
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    except asyncio.CancelledError:
+        pass            # the server is shutting down
+    finally:
+        writer.close()
+
+async def start_server(host=SERVER_HOST, port=SERVER_PORT, sock=None, reuse_port=False):
+    global _sfx_on
+    _sfx_on = False
+    if sock is not None:
+        return await asyncio.start_server(_serve_session, sock=sock)
+    return await asyncio.start_server(_serve_session, host, port, reuse_port=reuse_port)
+
+def serve(host=SERVER_HOST, port=SERVER_PORT):
+    async def run():
+        server = await start_server(host, port)
+        addr = server.sockets[0].getsockname()
+        print(f"  serving on {addr[0]}:{addr[1]}", flush=True)
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        _store().flush()
+
+async def loopback_client(host, port, name, lang='en', games=1, gap=0.0):
+    """A bot that logs in over TCP and plays `games` games; returns seconds per game."""
+    reader, writer = await asyncio.open_connection(host, port)
+    done = ('Press any key' if lang == 'en' else 'اضغط أي مفتاح').encode('utf-8')
+    letters = list(itertools.chain.from_iterable(_EN_ROWS if lang == 'en' else _AR_ROWS))
+    buf, pos, times = bytearray(), 0, []
+
+    async def first(*marks):
+        # wait for whichever mark shows up first after `pos`; returns it
+        nonlocal pos
+        while True:
+            hits = [(i, m) for m in marks for i in [buf.find(m, pos)] if i >= 0]
+            if hits:
+                i, m = min(hits)
+                pos = i + len(m)
+                return m
+            data = await reader.read(65536)
+            if not data:
+                raise ConnectionResetError('server closed')
+            buf.extend(data)
+    try:
+        writer.write(f"{name}\r\n{lang}\r\n".encode('utf-8'))
+        await first(b'[0]')
+        for _ in range(games):
+            t0 = time.perf_counter()
+            writer.write(b'1')
+            await first(b'[letter]')
+            for ch in letters:          # one key, then its frame or the result
+                await asyncio.sleep(gap)
+                writer.write(ch.encode('utf-8'))
+                if await first(b'[letter]', done) == done:
+                    break
+            else:
+                await first(done)
+            times.append(time.perf_counter() - t0)
+            writer.write(b' ')
+            await first(b'[0]')
+            del buf[:pos]
+            pos = 0
+        writer.write(b'0')
+        await writer.drain()
+    finally:
+        writer.close()
+    return times
+
+#
+#  SERVER WORKERS  (python hangman.py serve --workers N)
+#
+#  One event loop runs on one core.  serve_workers() forks N workers that
+#  each bind the port with SO_REUSEPORT, so the kernel spreads connections
+#  across them; the launcher keeps the port bound (without listening) and
+#  restarts any worker that exits.  The launcher is also the coordinator:
+#  only it opens the player store and the journal.  Workers keep players in
+#  a RemoteStore, which applies each game to the worker's copy at once and
+#  sends the records over a Unix socket in batches.  A batch is committed
+#  once the coordinator has applied and journaled it and replied; frames are
+#  length-prefixed, so a worker killed mid-send leaves a short frame that is
+#  dropped whole, and a killed worker loses at most its unsent batch.
+
+REMOTE_FLUSH = 0.05     # seconds a worker holds finished games before sending them
+REMOTE_BATCH = 64       # ... or this many records, whichever comes first
+
+def _send_frame(f, obj):
+    data = json.dumps(obj, ensure_ascii=False, separators=(',', ':'), default=_json_default).encode('utf-8')
+    f.write(struct.pack('>I', len(data)) + data)
+    f.flush()
+
+def _recv_frame(f):
+    head = f.read(4)
+    if len(head) < 4:
+        return None
+    n, = struct.unpack('>I', head)
+    data = f.read(n)
+    if len(data) < n:
+        return None             # the sender went away mid-frame
+    return json.loads(data)
+
+class RemoteStore:
+    """The coordinator's players, as seen from a server worker.
+
+    get() sends anything still queued, fetches the player and refreshes the
+    worker's copy in place, so all sessions of a player in this worker share
+    one object.  apply() folds a record into that copy for the result screen
+    and queues it; flush() freezes the queue into the next numbered batch and
+    sends it, taking back the coordinator's copies of the players it touched.
+    A batch that fails is resent as it was (same number, same records), so
+    the coordinator applies it once; records queued meanwhile wait for the
+    next batch.  `worker` must be unique per process the coordinator has
+    ever served, since batch numbers restart at 1.
+    """
+
+    def __init__(self, address, worker):
+        self.address = address
+        self.worker = worker
+        self.batches = 0
+        self._file = None
+        self._players = {}
+        self._pending = []
+        self._sending = None    # (number, records) of the batch not yet acknowledged
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def _call(self, msg):
+        # one request and its reply; reconnects and resends once
+        for _ in range(2):
+            try:
+                if self._file is None:
+                    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                        sock.connect(self.address)
+                        self._file = sock.makefile('rwb')
+                _send_frame(self._file, msg)
+                reply = _recv_frame(self._file)
+            except OSError:
+                reply = None
+            if reply is not None:
+                return reply
+            self.close()
+        raise ConnectionError('player coordinator unavailable')
+
+    def get(self, name):
+        with self._lock:
+            self.flush()
+            fresh = self._call({'op': 'get', 'u': name})['s']
+            stats = self._players.get(name)
+            if stats is None:
+                stats = self._players[name] = PlayerStats.from_dict(fresh)
+            else:
+                stats.update(fresh)
+            return stats
+
+    def put(self, name, stats):
+        with self._lock:
+            self.flush()
+            self._call({'op': 'put', 'u': name, 's': stats})
+            self._players[name] = stats
+
+    def apply(self, name, stats, rec):
+        with self._lock:
+            new = apply_record(stats, rec)
+            self._players.setdefault(name, stats)
+            self._pending.append(rec)
+            if len(self._pending) >= REMOTE_BATCH:
+                self._flush_later()
+            elif self._timer is None:
+                self._later()
+            return new
+
+    def _later(self):
+        self._timer = threading.Timer(REMOTE_FLUSH, self._flush_later)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_later(self):
+        with self._lock:
+            try:
+                self.flush()
+            except ConnectionError:
+                self._later()       # still queued: try again shortly
+
+    def all(self):
+        with self._lock:
+            self.flush()
+            players = self._call({'op': 'all'})['players']
+        return {name: PlayerStats.from_dict(d) for name, d in players.items()}
+
+    def top(self, k=LEADERBOARD_K):
+        with self._lock:
+            self.flush()
+            return [tuple(row) for row in self._call({'op': 'top', 'k': k})['top']]
+
+    def flush(self):
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            while self._sending or self._pending:
+                if self._sending is None:
+                    self._sending = (self.batches + 1, self._pending)
+                    self._pending = []
+                n, recs = self._sending
+                reply = self._call({'op': 'apply', 'w': self.worker, 'n': n, 'recs': recs})
+                self.batches, self._sending = n, None
+                for name, d in reply['s'].items():
+                    if name in self._players:
+                        self._players[name].update(d)
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+class _CoordinatorHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            while True:
+                msg = _recv_frame(self.rfile)
+                if msg is None:
+                    return
+                _send_frame(self.wfile, self.server.handle_message(msg))
+        except OSError:
+            pass                # the worker went away
+
+class Coordinator(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """The launcher's end of RemoteStore: one thread per worker connection."""
+    daemon_threads = True
+
+    def __init__(self, address):
+        super().__init__(address, _CoordinatorHandler)
+        self.applied = {}       # worker -> number of its last applied batch
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def handle_message(self, msg):
+        op = msg['op']
+        store = _store()
+        with self._lock:
+            if op == 'apply':
+                if msg['n'] > self.applied.get(msg['w'], 0):
+                    for rec in msg['recs']:
+                        commit_record(rec['u'], store.get(rec['u']), rec)
+                    self.applied[msg['w']] = msg['n']
+                    self.records += len(msg['recs'])
+                return {'s': {u: store.get(u) for u in {rec['u'] for rec in msg['recs']}}}
+            if op == 'get':
+                return {'s': store.get(msg['u'])}
+            if op == 'put':
+                store.put(msg['u'], PlayerStats.from_dict(msg['s']))
+                return {}
+            if op == 'top':
+                return {'top': store.top(msg['k'])}
+            if op == 'all':
+                return {'players': store.all()}
+        return {'error': f'unknown request {op!r}'}
+
+def _serve_worker(host, port, address, ready, worker):
+    # runs in a forked worker: sessions on a SO_REUSEPORT socket, players
+    # through the coordinator
+    global _players_store
+    _players_store = RemoteStore(address, worker)
+
+    async def run():
+        server = await start_server(host, port, reuse_port=True)
+        ready.release()
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, lambda: stop.done() or stop.set_result(None))
+        async with server:
+            await stop
+    try:
+        asyncio.run(run())
+    finally:
+        try:
+            _players_store.flush()
+        except ConnectionError:
+            pass
+
+def serve_workers(host=SERVER_HOST, port=SERVER_PORT, workers=None):
+    if not hasattr(socket, 'SO_REUSEPORT') or not hasattr(os, 'fork'):
+        print("  worker processes need fork() and SO_REUSEPORT; serving from one process")
+        return serve(host, port)
+    workers = workers or os.cpu_count() or 1
+    ctx = multiprocessing.get_context('fork')
+    # hold the port (bound, not listening) so workers can rebind it and an
+    # ephemeral port stays the same across restarts
+    hold = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET)
+    hold.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    hold.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    hold.bind((host, port))
+    port = hold.getsockname()[1]
+    folder = tempfile.mkdtemp(prefix='hangman-')
+    coordinator = Coordinator(os.path.join(folder, 'players.sock'))
+    threading.Thread(target=coordinator.serve_forever, daemon=True).start()
+    ready = ctx.Semaphore(0)
+    spawned = itertools.count(1)    # worker ids: a pid can be reused by a restart
+
+    def spawn():
+        proc = ctx.Process(target=_serve_worker, daemon=True,
+                           args=(host, port, coordinator.server_address, ready, next(spawned)))
+        proc.start()
+        return proc
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    procs = []
+    try:
+        procs = [spawn() for _ in range(workers)]
+        for _ in procs:
+            ready.acquire(timeout=10)
+        print(f"  serving on {host}:{port} with {workers} workers", flush=True)
+        while not stop.wait(0.5):
+            for i, proc in enumerate(procs):
+                if not proc.is_alive():
+                    print(f"  worker {proc.pid} exited ({proc.exitcode}); restarting", flush=True)
+                    procs[i] = spawn()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for proc in procs:      # workers send their last batches on the way out
+            proc.terminate()
+        for proc in procs:
+            proc.join(5)
+        coordinator.shutdown()
+        coordinator.server_close()
+        hold.close()
+        shutil.rmtree(folder, ignore_errors=True)
+        _store().flush()
+
+#
+#  BENCHMARKS  (python hangman.py bench <name>)
+#
+
+# The original per-sample synthesis, kept only as the benchmark baseline.
+def _ref_sine_wave(freq, duration, rate=SFX_RATE, volume=0.4, fade=0.06):
+    n = int(rate * duration)
+    fade_n = int(rate * fade)
+    out = []
+    for i in range(n):
+        amp = math.sin(2 * math.pi * freq * i / rate)
+        env = min(i / fade_n, 1.0, (n - i) / fade_n) if fade_n else 1.0
+        out.append(amp * env * volume * 32767)
+    return out
+
+def _ref_chord(frequencies, duration, volume=0.28, rate=SFX_RATE):
+    n = int(rate * duration)
+    out = [0.0] * n
+    for f in frequencies:
+        for i, s in enumerate(_ref_sine_wave(f, duration, rate, volume / len(frequencies))):
+            out[i] += s
+    return out
+
+def _ref_render_wav(recipe, rate=SFX_RATE):
+    samples = []
+    for kind, freq, dur, vol in recipe:
+        samples += (_ref_sine_wave(freq, dur, rate, vol) if kind == 'tone'
+                    else _ref_chord(freq, dur, vol, rate))
+    return b''.join(struct.pack('<h', max(-32767, min(32767, int(x)))) for x in samples)
+
+def _timeit(fn, repeat_n=5):
+    best = float('inf')
+    for _ in range(repeat_n):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def bench_synth(repeat_n=5):
+    recipes = list(_SFX.values())
+    old = _timeit(lambda: [_ref_render_wav(r) for r in recipes], repeat_n)
+    new = _timeit(lambda: [_pcm(_render(r)) for r in recipes], repeat_n)
+    engine = 'numpy' if np is not None else 'array'
+    print(f"  synth all {len(recipes)} effects: per-sample {old*1000:8.2f} ms   "
+          f"{engine} {new*1000:8.2f} ms   ×{old/new:.1f}")
+    return old, new
+
+def bench_audio(rounds=3):
+    # drives every effect through the mixer into the null sink, so the
+    # numbers are available on a machine without a sound card
+    global _backend, _mixer
+    _audio_close()
+    _bank.clear()
+    _backend = NullBackend()
+    _mixer = Mixer(_backend)
+    for _ in range(rounds):
+        for name in _SFX:
+            _sfx(name)
+            time.sleep(0.12)
+    time.sleep(0.5)
+    rep = audio_report()
+    print(f"  backend {rep['backend']}: synth {rep['synth_time']*1000:.1f} ms for "
+          f"{rep['synth_count']} renders, {rep['played']} played, {rep['dropped']} dropped, "
+          f"latency avg {rep['latency_avg']*1000:.1f} ms / max {rep['latency_max']*1000:.1f} ms")
+    return rep
+
+def bench_stats(n=100_000):
+    import tracemalloc
+    rng = random.Random(1)
+    ids = [a['id'] for a in ACHIEVEMENTS]
+    sample = []
+    for _ in range(n):
+        d = DEFAULT_STATS.copy()
+        d.update(points=rng.randint(0, 5000), wins=rng.randint(0, 200),
+                 losses=rng.randint(0, 200), total_time=rng.uniform(0, 9000),
+                 unlocked=rng.sample(ids, rng.randint(0, 6)))
+        sample.append(d)
+    blob = json.dumps(sample)
+    results = {}
+    for label, build in (('dict', lambda: json.loads(blob)),
+                         ('PlayerStats', lambda: [PlayerStats.from_dict(d) for d in json.loads(blob)])):
+        tracemalloc.start()
+        objs = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        results[label] = size
+        print(f"  {n} players as {label:<12} {size / 2**20:8.1f} MiB  ({size // n} B/player)")
+        del objs
+    return results
+
+def bench_words(sizes=(10_000, 100_000, 500_000)):
+    import tracemalloc
+    rng = random.Random(1)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    with tempfile.TemporaryDirectory() as d:
+        for n in sizes:
+            src, out = os.path.join(d, f'{n}.csv'), os.path.join(d, f'{n}.hwb')
+            with open(src, 'w', encoding='utf-8', newline='') as f:
+                w = csv.writer(f)
+                w.writerow(['word', 'category', 'hint'])
+                for i in range(n):
+                    word = ''.join(rng.choice(letters) for _ in range(rng.randint(4, 10)))
+                    tag = f'{i:x}'.translate(str.maketrans('0123456789', 'ghijklmnop'))   # keeps words unique
+                    w.writerow([f'{word} {tag}', f'cat{i % 40}', f'hint number {i % 1000}'])
+            compile_word_bank(import_words(src, 'en', 1)[0], out)
+            for label, load in (('text', lambda: import_words(src, 'en', 1)[0]),
+                                ('mmap', lambda: MappedWordBank(out))):
+                tracemalloc.start()
+                t0 = time.perf_counter()
+                bank = load()
+                for _ in range(1000):
+                    bank.random()
+                secs = time.perf_counter() - t0
+                size = tracemalloc.get_traced_memory()[0]
+                tracemalloc.stop()
+                print(f"  {n:>7} words  {label}: load + 1000 draws {secs*1000:9.1f} ms  {size / 2**20:8.2f} MiB")
+                if label == 'mmap':
+                    bank.close()
+                del bank
+
+def bench_alias(n=100_000, draws=2000):
+    # one draw per call, as play_game does
+    rng = random.Random(1)
+    population = range(n)
+    weights = [rng.paretovariate(1.2) for _ in range(n)]
+    cum = list(itertools.accumulate(weights))
+    t_build = _timeit(lambda: AliasTable(weights), 3)
+    table = AliasTable(weights)
+    results = {}
+    for label, fn in (('choices(weights)', lambda: rng.choices(population, weights)),
+                      ('choices(cum_weights)', lambda: rng.choices(population, cum_weights=cum)),
+                      ('alias table', lambda: table.sample(rng))):
+        k = draws // 20 if label == 'choices(weights)' else draws
+        secs = _timeit(lambda: [fn() for _ in range(k)], 3) / k
+        results[label] = secs
+        print(f"  {n} weighted words  {label:<22} {secs*1e6:10.2f} µs/draw")
+    print(f"  alias table build {t_build*1000:.1f} ms, once per weight configuration")
+    return results
+
+def bench_solver(n=100_000, games=200):
+    # solver games on a synthetic bank per alphabet, timing every suggest();
+    # 'cold' clears the memo before each guess, 'warm' keeps it across games
+    rng = random.Random(1)
+    results = {}
+    for lang, rows in (('en', _EN_ROWS), ('ar', _AR_ROWS)):
+        letters = ''.join(itertools.chain.from_iterable(rows))
+        weights = [1 / (i + 1) for i in range(len(letters))]     # Zipf-like letter mix
+        words = {''.join(rng.choices(letters, weights, k=rng.randint(4, 10))) for _ in range(n)}
+        bank = WordBank(lang, [{'w': w, 'h': ''} for w in sorted(words)], 'bench')
+        sv = Solver(bank)
+        for length in range(4, 11):
+            sv.length_index(length)
+        picks = [bank.draw(rng) for _ in range(games)]
+        for label in ('cold', 'warm'):
+            times = []
+            for i in picks:
+                game = GameState(bank[i]['w'], lang, 'hard')
+                while not game.outcome:
+                    if label == 'cold':
+                        sv._memo.clear()
+                    t0 = time.perf_counter()
+                    ch = sv.suggest(game)
+                    times.append(time.perf_counter() - t0)
+                    if ch is None or game.guess(ch) is None:
+                        break
+            times.sort()
+            p50, p90 = times[len(times) // 2], times[len(times) * 9 // 10]
+            results[lang, label] = p90
+            print(f"  {lang} {len(bank)} words, {label}: {len(times)} guesses, avg {sum(times) / len(times) * 1000:.3f} ms"
+                  f"  p50 {p50 * 1000:.3f} ms  p90 {p90 * 1000:.3f} ms")
+    return results
+
+def bench_keys(gap=0.03):
+    # types a pangram into the key-driven loop through a pseudo-terminal and
+    # reports keystroke-to-frame latency against one 60 Hz frame
+    global _sfx_on, input_stats
+    if termios is None:
+        print("  key input needs a POSIX terminal")
+        return None
+    master, slave = os.openpty()
+    sfx, _sfx_on, input_stats = _sfx_on, False, InputStats()
+    word = 'the quick brown fox jumps over a lazy dog'
+    keys = 'thequickbrownfxjmpsvlazydg'
+
+    def typist():
+        for i, ch in enumerate(keys):
+            os.write(master, ch.encode())
+            if i % 5 != 4:          # every fifth key arrives typed-ahead
+                time.sleep(gap)
+
+    t = threading.Thread(target=typist, daemon=True)
+    game = GameState(word, 'en', 'easy')
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            t.start()
+            _play_keys(game, game_clock(), 'bench', PlayerStats(), 'en', '', KeyReader(slave))
+    finally:
+        t.join()
+        _sfx_on = sfx
+        os.close(master)
+        os.close(slave)
+    st = input_stats
+    avg = st.latency_total / st.frames if st.frames else 0.0
+    print(f"  {len(keys)} keys, {st.frames} frames ({game.outcome}): latency avg {avg*1000:.2f} ms / "
+          f"max {st.latency_max*1000:.2f} ms (one 60 Hz frame is 16.7 ms)")
+    return st
+
+def bench_server(sessions=200, games=3, workers=1):
+    # a `serve` subprocess in a scratch folder, `sessions` loopback bots at
+    # once; memory and CPU are summed over the server's processes in /proc
+    with tempfile.TemporaryDirectory() as tmp:
+        proc = subprocess.Popen([sys.executable, os.path.abspath(__file__), 'serve', '--host', '127.0.0.1',
+                                 '--port', '0', '--workers', str(workers)],
+                                cwd=tmp, stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(re.search(r':(\d+)', proc.stdout.readline()).group(1))
+
+            def usage():
+                with open(f'/proc/{proc.pid}/task/{proc.pid}/children') as f:
+                    pids = [proc.pid] + f.read().split()
+                rss = ticks = 0
+                for pid in pids:
+                    with open(f'/proc/{pid}/status') as f:
+                        rss += next(int(l.split()[1]) for l in f if l.startswith('VmRSS:'))
+                    with open(f'/proc/{pid}/stat') as f:
+                        ticks += sum(map(int, f.read().rsplit(')', 1)[1].split()[11:13]))
+                return rss, ticks / os.sysconf('SC_CLK_TCK')
+
+            async def run():
+                async def bot(i):
+                    return await loopback_client('127.0.0.1', port, f'bot{i}', ('en', 'ar')[i % 2], games, 0.01)
+                done = asyncio.gather(*(bot(i) for i in range(sessions)))
+                peak = 0
+                while not done.done():
+                    peak = max(peak, usage()[0])
+                    await asyncio.wait([done], timeout=0.1)
+                return done.result(), peak
+
+            rss0, cpu0 = usage()
+            t0 = time.perf_counter()
+            times, peak = asyncio.run(run())
+            secs = time.perf_counter() - t0
+            cpu = usage()[1] - cpu0
+        finally:
+            proc.terminate()
+            proc.wait()
+    n = sum(map(len, times))
+    print(f"  {workers} worker(s), {sessions} sessions, {n} games in {secs:.2f}s [{n / secs:,.0f} games/s]: "
+          f"{(peak - rss0) / sessions:.1f} KB/session (server {rss0 / 1024:.1f} → {peak / 1024:.1f} MB), "
+          f"{cpu * 1000 / n:.2f} ms CPU/game")
+    return n / secs
+
+def bench_workers(sessions=400, games=3):
+    # the same load on one process and on one worker per core; the bots run
+    # in this process, so they need a spare core of their own to keep up
+    cores = os.cpu_count() or 1
+    base = bench_server(sessions, games, 1)
+    rate = bench_server(sessions, games, max(2, cores))
+    print(f"  {rate / base:.2f}× the games/s of one process on {cores} core(s)")
+    return rate / base
+
+BENCHMARKS = {
+    'synth': bench_synth,
+    'audio': bench_audio,
+    'stats': bench_stats,
+    'words': bench_words,
+    'alias': bench_alias,
+    'solver': bench_solver,
+    'keys': bench_keys,
+    'server': bench_server,
+    'workers': bench_workers,
+}
+
 #
 #  ENTRY POINT
 #
 
 def main():
+    threading.Thread(target=_bank.warm, daemon=True).start()
     clear()
     w = term_width()
     center_print(f"{CY}Welcome!  /  أهلاً بك!{R}", w)
@@ -1312,7 +5114,156 @@ def main():
             print(f"\n  {RD}{'Invalid choice.' if lang=='en' else 'اختيار غير صحيح.'}{R}")
             time.sleep(0.8)
 
+def _cli(argv):
+    import argparse
+    ap = argparse.ArgumentParser(prog='hangman.py')
+    ap.add_argument('--words', action='append', default=[], metavar='LANG=FILE',
+                    help='word bank to use instead of the built-in one (CSV, NDJSON or compiled .hwb)')
+    ap.add_argument('--theme', action='append', default=[], metavar='CATEGORY=PCT',
+                    help="weight a category, e.g. --theme Security=60 (percent of draws)")
+    sub = ap.add_subparsers(dest='cmd')
+    wp = sub.add_parser('import-words', help='import and validate a CSV/NDJSON word file')
+    wp.add_argument('file')
+    wp.add_argument('--lang', required=True, choices=['en', 'ar'])
+    wp.add_argument('--workers', type=int)
+    cp = sub.add_parser('compile-words', help='compile a word bank into a memory-mapped .hwb file')
+    cp.add_argument('file', help="CSV/NDJSON word file, or 'builtin'")
+    cp.add_argument('--lang', required=True, choices=['en', 'ar'])
+    cp.add_argument('-o', '--out', required=True)
+    bp = sub.add_parser('bench', help='run a micro-benchmark')
+    bp.add_argument('name', choices=sorted(BENCHMARKS))
+    ip = sub.add_parser('import-json', help='copy the JSON player file into SQLite')
+    ip.add_argument('--json', default=PLAYER_FILE)
+    ip.add_argument('--db', default=DB_FILE)
+    jp = sub.add_parser('journal', help='snapshot or compact the game journal')
+    jp.add_argument('action', choices=['snapshot', 'compact'])
+    dp = sub.add_parser('daily', help='print or validate the daily-challenge calendar')
+    dp.add_argument('--days', type=int, default=30)
+    dp.add_argument('--out', help='write the calendar as JSON')
+    dp.add_argument('--check', help='validate a calendar JSON file against this word bank')
+    vp = sub.add_parser('serve', help='host games for telnet/TCP clients')
+    vp.add_argument('--host', default=SERVER_HOST)
+    vp.add_argument('--port', type=int, default=SERVER_PORT)
+    vp.add_argument('--workers', type=int, default=1, help='worker processes sharing the port (0: one per core)')
+    sub.add_parser('check-leaderboard', help='verify the leaderboard index, rebuilding it if stale')
+    rp = sub.add_parser('replay', help='re-run recorded games (.hrp files or folders)')
+    rp.add_argument('paths', nargs='+')
+    rp.add_argument('--watch', type=float, metavar='SPEED',
+                    help='render each game at SPEED × real time instead of checking them headlessly')
+    sp = sub.add_parser('simulate', help='play bot games to balance difficulty and scoring')
+    sp.add_argument('--games', type=int, default=10000, help='games per language and difficulty')
+    sp.add_argument('--lang', choices=['en', 'ar'], action='append')
+    sp.add_argument('--difficulty', choices=TIERS, action='append')
+    sp.add_argument('--strategy', choices=sorted(STRATEGIES), default='solver')
+    sp.add_argument('--think', choices=sorted(THINK_MODELS), default='human')
+    sp.add_argument('--draw', choices=['tier', 'all'], default='tier',
+                    help="words from the difficulty's tier, or from the whole bank")
+    sp.add_argument('--seed', type=int, default=0)
+    sp.add_argument('--workers', type=int)
+    sp.add_argument('--words-out', metavar='LANG=FILE', action='append', default=[],
+                    help='write the bank with measured difficulty (use --draw all on one difficulty)')
+    args = ap.parse_args(argv)
+    specs = [s for s in os.environ.get('HANGMAN_WORDS', '').split(',') if s] + args.words
+    load_word_banks(specs)
+    theme = [s for s in os.environ.get('HANGMAN_THEME', '').split(',') if s] + args.theme
+    try:
+        set_category_weights(parse_category_weights(theme))
+    except ValueError as e:
+        ap.error(str(e))
+    if args.cmd == 'import-words':
+        bank, rep = import_words(args.file, args.lang, args.workers)
+        print(f"  {rep['rows']} rows → {rep['entries']} words ({rep['duplicates']} duplicates, "
+              f"{rep['rejected']} rejected) in {rep['seconds']:.2f}s  "
+              f"[{rep['rows_per_sec']:,.0f} rows/s, {rep['workers']} worker(s)]")
+        return True
+    if args.cmd == 'compile-words':
+        bank = word_bank(args.lang) if args.file == 'builtin' else import_words(args.file, args.lang)[0]
+        size = compile_word_bank(bank, args.out)
+        print(f"  {len(bank)} words → {args.out} ({size:,} bytes, version {bank.version})")
+        return True
+    if args.cmd == 'bench':
+        BENCHMARKS[args.name]()
+        return True
+    if args.cmd == 'import-json':
+        n = import_json_players(args.json, args.db)
+        print(f"  imported {n} players into {args.db}")
+        return True
+    if args.cmd == 'journal':
+        j = _journal()
+        if args.action == 'snapshot':
+            j.snapshot()
+            print(f"  snapshot written to {j.folder}")
+        else:
+            print(f"  merged {j.compact()} segments")
+        return True
+    if args.cmd == 'daily':
+        if args.check:
+            with open(args.check, 'r', encoding='utf-8') as f:
+                problems = validate_calendar(json.load(f))
+            for p in problems:
+                print(f"  {p}")
+            print(f"  {len(problems)} problem(s)")
+            return True
+        cal = daily_calendar(days=args.days)
+        if args.out:
+            _atomic_write_json(args.out, cal)
+        for c in cal:
+            print(f"  {c['date']}  {c['lang']}  {c['w']}")
+        return True
+    if args.cmd == 'simulate':
+        rep = simulate(args.games, tuple(args.lang or ('en', 'ar')), tuple(args.difficulty or TIERS),
+                       args.strategy, args.think, args.seed, args.workers, args.draw, specs)
+        for (lang, d), c in rep['cells'].items():
+            print(f"  {lang} {d:<6}  win {c['win_rate']:6.1%}  points {c['mean_points']:7.1f} "
+                  f"(p10 {c['p10']}, p50 {c['p50']}, p90 {c['p90']})  time bonus {c['time_share']:5.1%}")
+        for lang in rep['words']:
+            scores = word_difficulty(rep, lang)
+            ranked = sorted(scores, key=scores.get)
+            bank = word_bank(lang)
+            for label, pick in (('easiest', ranked[:3]), ('hardest', ranked[::-1][:3])):
+                print(f"  {lang} {label}: " + ', '.join(f"{bank[i]['w']} {scores[i]:.2f}" for i in pick))
+        for spec in args.words_out:
+            lang, _, path = spec.partition('=')
+            bank = with_difficulty(word_bank(lang), word_difficulty(rep, lang))
+            save_word_bank(bank, path)
+            print(f"  {len(bank)} words with measured difficulty → {path}")
+        print(f"  {rep['games']:,} games in {rep['seconds']:.1f}s "
+              f"[{rep['games_per_sec']:,.0f} games/s, {rep['workers']} worker(s), seed {rep['seed']}]")
+        return True
+    if args.cmd == 'replay':
+        if args.watch:
+            for path in replay_files(args.paths):
+                res = run_replay(Replay.load(path), speed=args.watch).result()
+                print(f"\n  {path}: {res['outcome']}, {res['points']} pts")
+            return True
+        n, bad, secs = check_replays(args.paths)
+        for path, want, got in bad:
+            print(f"  {path}: recorded {want}, replayed {got}")
+        print(f"  {n} replays, {len(bad)} mismatched, in {secs:.2f}s [{n / secs if secs else 0:,.0f}/s]")
+        if bad:
+            sys.exit(1)
+        return True
+    if args.cmd == 'serve':
+        if args.workers == 1:
+            serve(args.host, args.port)
+        else:
+            serve_workers(args.host, args.port, args.workers or None)
+        return True
+    if args.cmd == 'check-leaderboard':
+        store = _store()
+        if not hasattr(store, 'check_index'):
+            print(f"  {STORAGE} storage has no separate leaderboard index")
+        elif store.check_index():
+            print("  leaderboard index OK")
+        else:
+            store.index.save(store.path)
+            print("  leaderboard index was stale and has been rebuilt")
+        return True
+    return False
+
 if __name__ == '__main__':
+    if _cli(sys.argv[1:]):
+        sys.exit(0)
     try:
         main()
     except KeyboardInterrupt: